@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import hashlib
+import numbers
+import os
+from collections import OrderedDict
+import numpy
+
+
+# Persistent store for simulation results. Every result is saved in directory
+# as <hash>.npy, the hash being taken from the parameters that produced it, and
+# is loaded back memory mapped. Once the files add up to more than max_bytes
+# the least recently used ones are deleted (the file times keep the usage
+# order between runs). hits and misses count the lookups
+class SimulationCache(object):
+
+    def __init__(self, directory='simcache', max_bytes=2**30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.npy'):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+
+        # file name -> size, least recently used first
+        self.__entries = OrderedDict((name, size) for mtime, name, size in sorted(entries))
+        self.size = sum(self.__entries.values())
+
+
+    # Hash of the parameters, numbers are compared by value so 1, 1.0 and
+    # numpy.float64(1.0) give the same key
+    def key(self, *parameters):
+        normalized = tuple(float(value) if isinstance(value, numbers.Real) and not isinstance(value, bool)
+                           else value for value in parameters)
+        return hashlib.sha1(repr(normalized).encode()).hexdigest()
+
+
+    # Returns the stored array (memory mapped, read only) or None
+    def get(self, key):
+        name = key + '.npy'
+        if name in self.__entries:
+            path = os.path.join(self.directory, name)
+            try:
+                os.utime(path)
+                value = numpy.load(path, mmap_mode='r')
+            except (OSError, ValueError):
+                # deleted or truncated behind our back
+                self.size -= self.__entries.pop(name)
+            else:
+                self.__entries.move_to_end(name)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+
+    def put(self, key, value):
+        name = key + '.npy'
+        path = os.path.join(self.directory, name)
+
+        # written under a temporary name first so a reader never sees half a file
+        temp = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(temp, 'wb') as f:
+            numpy.save(f, numpy.asarray(value))
+        os.replace(temp, path)
+
+        self.size -= self.__entries.pop(name, 0)
+        self.__entries[name] = os.path.getsize(path)
+        self.size += self.__entries[name]
+
+        self.__evict()
+        return value
+
+
+    # Returns the cached result for parameters, calling compute() and
+    # storing what it returns on a miss
+    def fetch(self, parameters, compute):
+        key = self.key(*parameters)
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+
+        return value
+
+
+    def clear(self):
+        for name in list(self.__entries):
+            self.__remove(name)
+
+
+    # drops the oldest results, the newest one is always kept
+    def __evict(self):
+        while self.size > self.max_bytes and len(self.__entries) > 1:
+            self.__remove(next(iter(self.__entries)))
+
+
+    def __remove(self, name):
+        self.size -= self.__entries.pop(name)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
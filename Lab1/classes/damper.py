@@ -8,6 +8,17 @@
 # x = position, x_dot=velocity, x_dotdot = accelleration
 # Write a function to calculate the current acceleration, given m, k, c, x, x_dot.
 
+import numpy
+
+# Integrators accepted by the simulations
+#   euler       the original lab update, the position moves by x_dot each epoch (not x_dot * t)
+#   symplectic  semi implicit euler, first order
+#   verlet      velocity verlet, second order
+#   rk4         classic 4th order runge kutta
+#   exact       exact propagator of the linear system, exact at every epoch for any t
+integrators = ('euler', 'symplectic', 'verlet', 'rk4', 'exact')
+
+
 class Damper(object):
     def __init__(self,  m=1.0, k=1.0, c=1.0):
         self.m = m
@@ -19,19 +30,27 @@ class Damper(object):
         return ((-1 * self.x * self.k) + (-1 * self.x_dot * self.c)) / self.m
 
 
-    def dampOverTime(self, x=1.0, x_dot=0.0,  t=0.01, epoch=1000, out=False):
+    # If a SimulationCache is given (and the positions are not printed) the
+    # positions are looked up there first and stored there after a new run,
+    # followed by the final velocity so a hit leaves the damper in the same
+    # state as a run
+    def dampOverTime(self, x=1.0, x_dot=0.0,  t=0.01, epoch=1000, out=False, cache=None, integrator='euler'):
+        if cache is not None and out == False:
+            stored = cache.fetch(('dampOverTime', self.m, self.k, self.c, t, epoch, x, x_dot, integrator),
+                                 lambda: self.__cachedRun(x, x_dot, t, epoch, integrator))
+            self.x = float(stored[-2]) if epoch > 0 else x
+            self.x_dot = float(stored[-1])
+            return stored[:epoch].tolist()
+
+        step = self.__getStepFunction(integrator, t)
         self.x = x
         self.x_dot = x_dot
-   
+
         retval = []
 
         for n in range(epoch):
-            #calculates the accelleration
-            acceleration = self.getAcceleration() * t
-            #updates the velocity
-            self.x_dot = self.x_dot + acceleration
-            #updates the position
-            self.x = self.x + (self.x_dot)
+            #updates the velocity and the position
+            self.x, self.x_dot = step(self.x, self.x_dot)
 
             #if needed prints out the current position
             if out == True :
@@ -43,3 +62,163 @@ class Damper(object):
         return retval
 
 
+    # Same simulation as dampOverTime but the positions are written into a
+    # preallocated numpy array, one epoch per element. Returns the buffer
+    def dampOverTimeInto(self, out, x=1.0, x_dot=0.0, t=0.01, integrator='euler'):
+        self.x = x
+        self.x_dot = x_dot
+
+        return self.__fill(out, self.__getStepFunction(integrator, t))
+
+
+    # positions of dampOverTime and the final velocity, as stored in the cache
+    def __cachedRun(self, x, x_dot, t, epoch, integrator):
+        buffer = numpy.empty(epoch + 1)
+        self.dampOverTimeInto(buffer[:epoch], x, x_dot, t, integrator)
+        buffer[epoch] = self.x_dot
+
+        return buffer
+
+
+    # Generator version of dampOverTime, yields the positions in numpy chunks
+    # of (at most) chunk elements so long runs only need one chunk in memory
+    def dampOverTimeStream(self, x=1.0, x_dot=0.0, t=0.01, epoch=1000, chunk=4096, integrator='euler'):
+        step = self.__getStepFunction(integrator, t)
+        self.x = x
+        self.x_dot = x_dot
+
+        for start in range(0, epoch, chunk):
+            yield self.__fill(numpy.empty(min(chunk, epoch - start)), step)
+
+
+    # Largest distance between the positions of the integrator and the exact
+    # solution over the run
+    def estimateError(self, x=1.0, x_dot=0.0, t=0.01, epoch=1000, integrator='euler'):
+        positions = self.dampOverTimeInto(numpy.empty(epoch), x, x_dot, t, integrator)
+        exact = self.dampOverTimeInto(numpy.empty(epoch), x, x_dot, t, 'exact')
+
+        return numpy.abs(positions - exact).max()
+
+
+    # Advances the current state one epoch per element of buffer,
+    # locals are used in the loop as attribute lookups are slow
+    def __fill(self, buffer, step):
+        x, x_dot = self.x, self.x_dot
+
+        for n in range(len(buffer)):
+            x, x_dot = step(x, x_dot)
+            buffer[n] = x
+
+        self.x, self.x_dot = x, x_dot
+        return buffer
+
+
+    # Runs many systems at once. m, k, c (set in the constructor) and x, x_dot
+    # can be scalars or arrays, they are broadcast together and every system is
+    # advanced in the same numpy step using the same update as dampOverTime.
+    # Returns a (systems x epoch) array of positions
+    def dampOverTimeBatch(self, x=1.0, x_dot=0.0, t=0.01, epoch=1000, integrator='euler'):
+        m, k, c, x, x_dot = numpy.broadcast_arrays(
+            *[numpy.asarray(value, dtype=float) for value in (self.m, self.k, self.c, x, x_dot)])
+
+        m, k, c = m.ravel(), k.ravel(), c.ravel()
+        #broadcast_arrays returns read only views, the state needs its own copy
+        x, x_dot = x.ravel().copy(), x_dot.ravel().copy()
+
+        retval = numpy.empty((epoch, x.size))
+
+        if integrator == 'euler':
+            for n in range(epoch):
+                acceleration = ((-1 * x * k) + (-1 * x_dot * c)) / m * t
+                x_dot += acceleration
+                x += x_dot
+                retval[n] = x
+
+        else:
+            step = self.__getStepFunction(integrator, t, m, k, c)
+            for n in range(epoch):
+                x, x_dot = step(x, x_dot)
+                retval[n] = x
+
+        return retval.T
+
+
+    # Returns a function taking (x, x_dot) and returning them one epoch of
+    # length t later. m, k, c default to the damper's own
+    def __getStepFunction(self, integrator='euler', t=0.01, m=None, k=None, c=None):
+        if m is None: m, k, c = self.m, self.k, self.c
+
+        def acceleration(x, x_dot):
+            return ((-1 * x * k) + (-1 * x_dot * c)) / m
+
+        if integrator == 'euler':
+            def step(x, x_dot):
+                x_dot = x_dot + acceleration(x, x_dot) * t
+                return x + x_dot, x_dot
+
+        elif integrator == 'symplectic':
+            def step(x, x_dot):
+                x_dot = x_dot + acceleration(x, x_dot) * t
+                return x + x_dot * t, x_dot
+
+        elif integrator == 'verlet':
+            # the damping force depends on the velocity, so the new acceleration
+            # uses the velocity predicted with the old one
+            def step(x, x_dot):
+                a = acceleration(x, x_dot)
+                x_next = x + x_dot * t + 0.5 * a * t * t
+                a_next = acceleration(x_next, x_dot + a * t)
+                return x_next, x_dot + 0.5 * (a + a_next) * t
+
+        elif integrator == 'rk4':
+            def step(x, x_dot):
+                k1x, k1v = x_dot, acceleration(x, x_dot)
+                k2x, k2v = x_dot + 0.5 * t * k1v, acceleration(x + 0.5 * t * k1x, x_dot + 0.5 * t * k1v)
+                k3x, k3v = x_dot + 0.5 * t * k2v, acceleration(x + 0.5 * t * k2x, x_dot + 0.5 * t * k2v)
+                k4x, k4v = x_dot + t * k3v, acceleration(x + t * k3x, x_dot + t * k3v)
+                return (x + t / 6 * (k1x + 2 * k2x + 2 * k3x + k4x),
+                        x_dot + t / 6 * (k1v + 2 * k2v + 2 * k3v + k4v))
+
+        elif integrator == 'exact':
+            a11, a12, a21, a22 = self.__propagator(t, m, k, c)
+
+            def step(x, x_dot):
+                return a11 * x + a12 * x_dot, a21 * x + a22 * x_dot
+
+        else:
+            raise ValueError('{0} is not a valid integrator'.format(integrator))
+
+        return step
+
+
+    # Matrix exponential e^(At) of the system matrix A = [[0, 1], [-k/m, -c/m]].
+    # With s = -c/2m and q = sqrt(s^2 - k/m) (complex when under damped)
+    #   e^(At) = e^(st) [(cosh(qt) - s sinh(qt)/q) I + sinh(qt)/q A]
+    # When over damped e^(st) cosh(qt) and e^(st) sinh(qt)/q are written with
+    # the two exponentials e^((s+q)t) and e^((s-q)t) (as smd._decay in Lab3),
+    # cosh alone overflows for large qt while e^(st) underflows.
+    # Returns the 4 coefficients (floats, or arrays for arrays of m, k, c)
+    def __propagator(self, t, m, k, c):
+        s = -c / (2 * m)
+        disc = numpy.asarray(s * s - k / m, dtype=float)
+        q = numpy.sqrt(numpy.abs(disc))
+
+        with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            slow = numpy.exp((s + q) * t)
+            fast = numpy.exp((s - q) * t)
+            decay = numpy.exp(s * t)
+
+            # e^(st) cosh(qt) and e^(st) sinh(qt)/q (cos and sin when under damped)
+            cosh = numpy.where(disc > 0, (slow + fast) / 2, decay * numpy.cos(q * t))
+            sinhc = numpy.where(disc > 0, (slow - fast) / (2 * q), decay * numpy.sin(q * t) / q)
+            sinhc = numpy.where(q == 0, t * decay, sinhc)
+
+        a11 = cosh - s * sinhc
+        a12 = sinhc
+        a21 = sinhc * (-k / m)
+        a22 = cosh - s * sinhc - sinhc * c / m
+
+        if numpy.ndim(a11) == 0:
+            return float(a11), float(a12), float(a21), float(a22)
+
+        return a11, a12, a21, a22
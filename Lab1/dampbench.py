@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+# Compares the accuracy of the Damper integrators against the cpu time they
+# need. Every integrator simulates the same system for the same amount of
+# simulated time with a range of step sizes, and the error is the largest
+# distance from the exact solution.
+
+from classes.damper import Damper, integrators
+from time import process_time
+import sys
+
+#Constants
+simulated_time = 20.0
+steps = [0.001, 0.01, 0.05, 0.1, 0.5]
+repeats = 3
+
+# m, k, c, x, x_dot  (the under damped lab simulation)
+_params = (1.0, 1.0, 0.25, 1.0, 0.0)
+
+
+# best of repeats cpu time of a run, and its error
+def benchmark(integrator, t):
+    m, k, c, x, x_dot = _params
+    _damper = Damper(m=m, k=k, c=c)
+    epoch = int(round(simulated_time / t))
+
+    seconds = min(timeRun(_damper, x, x_dot, t, epoch, integrator) for n in range(repeats))
+    error = _damper.estimateError(x=x, x_dot=x_dot, t=t, epoch=epoch, integrator=integrator)
+
+    return epoch, seconds, error
+
+
+def timeRun(_damper, x, x_dot, t, epoch, integrator):
+    start = process_time()
+    _damper.dampOverTime(x=x, x_dot=x_dot, t=t, epoch=epoch, integrator=integrator)
+    return process_time() - start
+
+
+def main(argv):
+    print('{0:<12}{1:>8}{2:>10}{3:>14}{4:>14}'.format('integrator', 't', 'epochs', 'cpu (s)', 'max error'))
+
+    for integrator in integrators:
+        for t in steps:
+            epoch, seconds, error = benchmark(integrator, t)
+            print('{0:<12}{1:>8}{2:>10}{3:>14.6f}{4:>14.3e}'.format(integrator, t, epoch, seconds, error))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
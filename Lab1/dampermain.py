@@ -5,7 +5,7 @@
 
 
 from classes.damper import Damper
-import sys, getopt
+import sys, getopt, struct
 import numpy
 import matplotlib.pyplot as plt
 
@@ -14,7 +14,7 @@ normal_termination = 0
 command_line_syntax_error = 2
 
 helpstring = '''
-dampermain.py -o <option> -p <option>
+dampermain.py -o <option> -p <option> -w <file> -g <option>
     -h prints this help out
 
     -o options:
@@ -27,6 +27,17 @@ dampermain.py -o <option> -p <option>
         0 = do not print individual positions to the console
         1 = print individual positions to the console
 
+     -w file:
+        writes all the simulations at once instead of printing them as text
+        file.npy = numpy array (simulations x epochs)
+        file.npz = numpy archive with the positions and the parameters
+        any other name = raw little endian float64 with a 24 byte header
+                         ('DAMP', version, 0, simulations, epochs as <4sHHQQ)
+
+     -g options:
+        0 = headless, do not show any graph
+        1 = show the graphs (default)
+
     Examples:
     To run the 2nd simulation WITH matplotlib and output enabled (can be viewed in Gnuplot)
       run ./dampermain.py -o2 -p1  > test
@@ -39,6 +50,9 @@ dampermain.py -o <option> -p <option>
 
     To run all simulations at once with output DISABLED
       run ./dampermain.py -p0 > test (cannot be viewed in Gnuplot)
+
+    To write all simulations to a numpy file without any graph
+      run ./dampermain.py -g0 -w test.npy
     '''
 
 errorstring = '''{0} is not a valid option value. Type dampermain.py -h for help'''
@@ -53,12 +67,19 @@ _paramsSet = [(1.0, 1.0, 0.0, 1.0, 0.0),
               (1.0, 1.0, 1.0, 1.0, 0.0),
               (1.0, 1.0, 1.0, 1.0, 1.0)]
 
+# header of the raw output file: magic, version, reserved, simulations, epochs
+rawHeader = struct.Struct('<4sHHQQ')
+rawMagic = b'DAMP'
+rawVersion = 1
+
 #Variables
 _outputArray = []
 _printPosition = False
+_outputFile = None
+_showGraphs = True
 
 def select(argv):
-    global _printPosition
+    global _printPosition, _outputFile, _showGraphs
 
     retval = 0
     # if no argument then runs all the simulations and uses matplotlib
@@ -66,7 +87,7 @@ def select(argv):
         return 0
     else: #parses the arguments
         try:
-            opts, args = getopt.getopt(argv, "ho:p:", ["option=", "print="])
+            opts, args = getopt.getopt(argv, "ho:p:w:g:", ["option=", "print=", "write=", "graphs="])
         except getopt.GetoptError:
             print(helpstring)
             sys.exit(command_line_syntax_error)
@@ -97,6 +118,16 @@ def select(argv):
                     print(errorstring.format(arg))
                     sys.exit(command_line_syntax_error)
 
+            elif opt in ("-w", "--write"):
+                _outputFile = arg
+
+            elif opt in ("-g", "--graphs"):
+                try:
+                    _showGraphs = int(arg) != 0
+                except ValueError:
+                    print(errorstring.format(arg))
+                    sys.exit(command_line_syntax_error)
+
     return retval
 
 
@@ -106,17 +137,68 @@ def getDamperData(_tuple, _out=False):
     return retval
 
 
+# Runs all the parameter tuples in a single vectorized pass
+def getDamperDataBatch(_tuples):
+    _params = numpy.array(_tuples, dtype=float)
+    _damper = Damper(m=_params[:, m], k=_params[:, k], c=_params[:, c])
+    retval = _damper.dampOverTimeBatch(x=_params[:, x], x_dot=_params[:, x_dot], t=0.01, epoch=1000)
+    return retval
+
+
 def getValues(selectedValue, _out=False):
-    retval = []
     if selectedValue == 0:
-        for n in range(len(_paramsSet)):
-            _tuple = _paramsSet[n]
-            retval.append(getDamperData(_tuple, _out))
+        _tuples = _paramsSet
     else:
-        _tuple = _paramsSet[selectedValue - 1]
-        retval.append(getDamperData(_tuple, _out))
+        _tuples = [_paramsSet[selectedValue - 1]]
+
+    # printing every position needs the step by step simulation
+    if _out:
+        return [getDamperData(_tuple, _out) for _tuple in _tuples]
+
+    return list(getDamperDataBatch(_tuples))
+
+# Writes all the simulations in one go, the format depends on the file extension
+def writeValues(filename, data, selectedValue=0):
+    positions = numpy.array(data, dtype='<f8')
+
+    if filename.endswith('.npy'):
+        numpy.save(filename, positions)
+
+    elif filename.endswith('.npz'):
+        params = _paramsSet if selectedValue == 0 else [_paramsSet[selectedValue - 1]]
+        numpy.savez(filename, positions=positions, params=numpy.array(params))
+
+    else:
+        with open(filename, 'wb') as f:
+            f.write(rawHeader.pack(rawMagic, rawVersion, 0, positions.shape[0], positions.shape[1]))
+            positions.tofile(f)
+
+
+# Reads back a file written by writeValues, returns a (simulations x epochs) array.
+# Raw files are memory mapped
+def readValues(filename):
+    if filename.endswith('.npy'):
+        return numpy.load(filename)
+
+    if filename.endswith('.npz'):
+        with numpy.load(filename) as archive:
+            return archive['positions']
+
+    with open(filename, 'rb') as f:
+        magic, version, reserved, rows, cols = rawHeader.unpack(f.read(rawHeader.size))
+
+    if magic != rawMagic or version != rawVersion:
+        raise ValueError('{0} is not a damper output file'.format(filename))
+
+    return numpy.memmap(filename, dtype='<f8', mode='r', offset=rawHeader.size, shape=(rows, cols))
+
+
+# Prints a simulation as 'epoch position' lines for gnuplot,
+# formatted in one go rather than one print per line
+def printValues(data):
+    lines = map('{0} {1}'.format, range(len(data)), list(data))
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-    return retval
 
 # Plots the various functions .
 # From an example at http://matplotlib.org/examples/pylab_examples/subplots_demo.html
@@ -146,17 +228,21 @@ def main(argv):
 
     #retrieves the data according to the selected argument
     _outputArray = getValues(selectedValue, _printPosition)
+
+    #binary output replaces the text output
+    if _outputFile is not None:
+        writeValues(_outputFile, _outputArray, selectedValue)
+
     if selectedValue != 0:
         for n in range(len(_outputArray)):
             _array = _outputArray[n]
             if _printPosition != True:
-                for x in range(len(_array)):
-                    value = _array[x]
-                    print('{0} {1}'.format(x, value))
-            else:
+                if _outputFile is None:
+                    printValues(_array)
+            elif _showGraphs:
                 showGraph(_array)
 
-    else:
+    elif _showGraphs:
         showGraphs(_outputArray)
 
 
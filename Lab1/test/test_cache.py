@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.cache import SimulationCache
+from classes.damper import Damper
+
+
+class TestSimulationCache(TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = self.temp.name
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    # size of the file one of the test arrays is stored in
+    def fileSize(self, cache):
+        cache.put('probe', numpy.zeros(1000))
+        size = cache.size
+        cache.clear()
+        return size
+
+    def test_hits_misses(self):
+        cache = SimulationCache(self.directory)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        cache.put('key', numpy.arange(5.0))
+        self.assertEqual(cache.get('key').tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        calls = []
+        compute = lambda: calls.append(1) or numpy.ones(3)
+        for n in range(3):
+            self.assertEqual(cache.fetch(('fetch', 1), compute).tolist(), [1.0, 1.0, 1.0])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+
+    def test_key(self):
+        cache = SimulationCache(self.directory)
+        self.assertEqual(cache.key('a', 1), cache.key('a', 1.0))
+        self.assertEqual(cache.key('a', 1), cache.key('a', numpy.float64(1.0)))
+        self.assertEqual(cache.key('a', 1), cache.key('a', numpy.int64(1)))
+        self.assertNotEqual(cache.key('a', 1), cache.key('a', True))
+        self.assertNotEqual(cache.key('a', 1), cache.key('a', 2))
+        self.assertNotEqual(cache.key('a', 1), cache.key('b', 1))
+        self.assertNotEqual(cache.key('a', 1, None), cache.key('a', 1))
+
+    def test_eviction(self):
+        size = self.fileSize(SimulationCache(self.directory))
+        cache = SimulationCache(self.directory, max_bytes=2 * size + size // 2)
+
+        cache.put('a', numpy.zeros(1000))
+        cache.put('b', numpy.zeros(1000))
+        self.assertIsNotNone(cache.get('a'))    # b is now the least recently used
+        cache.put('c', numpy.zeros(1000))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.size, 2 * size)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.npy', 'c.npy'])
+
+        # one result larger than max_bytes is still kept
+        cache.put('large', numpy.zeros(10000))
+        self.assertEqual(os.listdir(self.directory), ['large.npy'])
+
+    def test_reload(self):
+        cache = SimulationCache(self.directory)
+        size = self.fileSize(cache)
+        for n, name in enumerate(['a', 'b', 'c']):
+            cache.put(name, numpy.full(1000, n))
+            # usage order through the file times, b oldest, then c, then a
+            os.utime(os.path.join(self.directory, name + '.npy'), (1000 + (n+2) % 3, 1000 + (n+2) % 3))
+
+        restarted = SimulationCache(self.directory, max_bytes=3 * size)
+        self.assertEqual(restarted.size, 3 * size)
+        self.assertEqual(restarted.get('c').tolist(), [2.0] * 1000)
+        self.assertEqual((restarted.hits, restarted.misses), (1, 0))
+
+        # a and c were used after b, b goes first
+        restarted.put('d', numpy.zeros(1000))
+        self.assertIsNone(restarted.get('b'))
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.npy', 'c.npy', 'd.npy'])
+
+    def test_damper_state(self):
+        cache = SimulationCache(self.directory)
+        for integrator in ['euler', 'rk4']:
+            for epoch in [0, 1, 100]:
+                run = Damper(2.0, 3.0, 0.5)
+                positions = run.dampOverTime(1.0, 0.5, 0.01, epoch, integrator=integrator)
+
+                for n in range(2):
+                    damper = Damper(2.0, 3.0, 0.5)
+                    self.assertEqual(damper.dampOverTime(1.0, 0.5, 0.01, epoch, cache=cache, integrator=integrator), positions)
+                    self.assertEqual((damper.x, damper.x_dot), (run.x, run.x_dot))
+
+        self.assertEqual((cache.hits, cache.misses), (6, 6))
@@ -0,0 +1,82 @@
+import os
+import sys
+from math import cos, exp, sin, sqrt
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.damper import Damper, integrators
+
+
+class TestDamper(TestCase):
+    def setUp(self):
+        self.damper = Damper(2.0, 3.0, 0.5)
+
+    def test_batch(self):
+        masses, springs = numpy.array([2.0, 1.0, 5.0]), numpy.array([3.0, 4.0, 0.5])
+        positions = numpy.array([1.0, -0.5, 2.0])
+        for integrator in integrators:
+            batch = Damper(masses, springs, 0.5).dampOverTimeBatch(positions, 0.3, 0.01, 300, integrator)
+            self.assertEqual(batch.shape, (3, 300))
+            for n in range(3):
+                single = Damper(masses[n], springs[n], 0.5).dampOverTime(positions[n], 0.3, 0.01, 300, integrator=integrator)
+                self.assertEqual(batch[n].tolist(), single, integrator)
+
+    def test_into_stream(self):
+        for integrator in integrators:
+            positions = self.damper.dampOverTime(1.0, 0.3, 0.01, 1000, integrator=integrator)
+            state = (self.damper.x, self.damper.x_dot)
+
+            into = self.damper.dampOverTimeInto(numpy.empty(1000), 1.0, 0.3, 0.01, integrator)
+            self.assertEqual(into.tolist(), positions, integrator)
+            self.assertEqual((self.damper.x, self.damper.x_dot), state)
+
+            for chunk in [1, 7, 4096]:
+                streamed = numpy.concatenate(list(self.damper.dampOverTimeStream(1.0, 0.3, 0.01, 1000, chunk, integrator)))
+                self.assertEqual(streamed.tolist(), positions, (integrator, chunk))
+                self.assertEqual((self.damper.x, self.damper.x_dot), state)
+
+    def test_exact(self):
+        # under damped, alpha = c/2m, w = sqrt(k/m - alpha^2)
+        alpha = 0.5 / (2 * 2.0)
+        w = sqrt(3.0 / 2.0 - alpha ** 2)
+        positions = self.damper.dampOverTime(1.0, 0.3, 0.05, 400, integrator='exact')
+        for n, position in enumerate(positions):
+            t = 0.05 * (n + 1)
+            self.assertAlmostEqual(position, exp(-alpha * t) * (cos(w * t) + (0.3 + alpha) / w * sin(w * t)), places=12)
+
+        # critically damped, c = 2 sqrt(k m)
+        positions = Damper(1.0, 4.0, 4.0).dampOverTime(1.0, 0.3, 0.05, 400, integrator='exact')
+        for n, position in enumerate(positions):
+            t = 0.05 * (n + 1)
+            self.assertAlmostEqual(position, exp(-2 * t) * (1.0 + (0.3 + 2) * t), places=12)
+
+        # strongly over damped with large steps, alpha = c/2m, q = sqrt(alpha^2 - k/m)
+        for m, k, c, t in [(1.0, 1.0, 50.0, 30.0), (1.0, 1.0, 1000.0, 2.0)]:
+            alpha = c / (2 * m)
+            q = sqrt(alpha ** 2 - k / m)
+            slow, fast = q - alpha, -q - alpha
+            positions = Damper(m, k, c).dampOverTime(1.0, 0.0, t, 5, integrator='exact')
+            batch = Damper(numpy.array([m, m]), k, c).dampOverTimeBatch(1.0, 0.0, t, 5, 'exact')
+            for n, position in enumerate(positions):
+                time = t * (n + 1)
+                expected = (fast * exp(slow * time) - slow * exp(fast * time)) / (fast - slow)
+                self.assertAlmostEqual(position / expected, 1.0, places=9)
+                self.assertEqual(batch[0, n], position)
+
+            # the exact reference of estimateError over the same span, with a step rk4 is stable with
+            self.assertLess(Damper(m, k, c).estimateError(1.0, 0.0, 0.001, int(5 * t / 0.001), 'rk4'), 1e-6)
+
+    def test_error_order(self):
+        # halving t over the same time span divides the error by 2^order
+        for integrator, order in [('symplectic', 1), ('verlet', 2), ('rk4', 4)]:
+            errors = [self.damper.estimateError(1.0, 0.0, t, int(round(5 / t)), integrator) for t in [0.04, 0.02, 0.01]]
+            for coarse, fine in zip(errors, errors[1:]):
+                self.assertAlmostEqual(coarse / fine, 2 ** order, delta=0.1 * 2 ** order)
+
+        self.assertLess(self.damper.estimateError(1.0, 0.0, 0.01, 500, 'exact'), 1e-12)
+
+    def test_invalid_integrator(self):
+        self.assertRaises(ValueError, self.damper.dampOverTime, 1.0, 0.0, 0.01, 10, integrator='foo')
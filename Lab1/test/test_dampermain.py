@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+lab = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, lab)
+
+import dampermain
+
+
+# the positions of the original lab loop
+def original_positions(m, k, c, x, x_dot, t=0.01, epoch=1000):
+    retval = []
+    for n in range(epoch):
+        acceleration = ((-1 * x * k) + (-1 * x_dot * c)) / m * t
+        x_dot = x_dot + acceleration
+        x = x + x_dot
+        retval.append(x)
+    return retval
+
+
+class TestDamperMain(TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.data = dampermain.getValues(0)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_round_trip(self):
+        for name in ['out.npy', 'out.npz', 'out.raw', 'out']:
+            filename = os.path.join(self.temp.name, name)
+            dampermain.writeValues(filename, self.data)
+            values = dampermain.readValues(filename)
+            self.assertEqual(values.shape, (3, 1000))
+            self.assertEqual(values.tolist(), numpy.array(self.data).tolist(), name)
+            del values
+
+        with numpy.load(os.path.join(self.temp.name, 'out.npz')) as archive:
+            self.assertEqual(archive['params'].tolist(), [list(params) for params in dampermain._paramsSet])
+
+        filename = os.path.join(self.temp.name, 'single.npz')
+        dampermain.writeValues(filename, self.data[1:2], 2)
+        with numpy.load(filename) as archive:
+            self.assertEqual(archive['params'].tolist(), [list(dampermain._paramsSet[1])])
+
+    def test_raw_header(self):
+        filename = os.path.join(self.temp.name, 'out.raw')
+        dampermain.writeValues(filename, self.data)
+        with open(filename, 'rb') as f:
+            header = dampermain.rawHeader.unpack(f.read(dampermain.rawHeader.size))
+        self.assertEqual(header, (b'DAMP', 1, 0, 3, 1000))
+        self.assertEqual(os.path.getsize(filename), 24 + 3 * 1000 * 8)
+
+        with open(filename, 'r+b') as f:
+            f.write(b'PMAD')
+        self.assertRaises(ValueError, dampermain.readValues, filename)
+
+    def test_text_output(self):
+        environment = dict(os.environ, MPLBACKEND='Agg')
+        for option in [1, 2, 3]:
+            output = subprocess.run([sys.executable, 'dampermain.py', '-p0', '-o{0}'.format(option)], cwd=lab,
+                                    env=environment, stdout=subprocess.PIPE, check=True).stdout.decode()
+            positions = original_positions(*dampermain._paramsSet[option - 1])
+            self.assertEqual(output, ''.join('{0} {1}\n'.format(n, value) for n, value in enumerate(positions)))
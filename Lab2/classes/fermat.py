@@ -1,5 +1,20 @@
 #!/usr/bin/python3
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import itertools
+import json
+import os
+import time
+import numpy
+
+# a^n + b^n can only equal c^n if it does modulo this too, 720720 =
+# 2^4 3^2 5 7 11 13 is small enough for int64 products and has many factors
+# to rule sums out with
+prefilter_modulus = 720720
+
+# seconds between the saves of a search's checkpoint
+checkpoint_interval = 10.0
+
 class Fermat(object):
     CORRECT = 'No, that doesn’t work.'
     INCORRECT = 'Holy smokes, Fermat was wrong!'
@@ -25,4 +40,159 @@ class Fermat(object):
             print('{0} = {1} for n = {2}'.format(value, c**n, n))
             return self.INCORRECT
 
-        return self.CORRECT
\ No newline at end of file
+        return self.CORRECT
+
+
+    # Looks for a^n + b^n = c^n with 1 <= a <= b <= amax and nmin <= n <= nmax
+    # (see search). Returns the (a, b, c, n) found, checked and candidates
+    # count the pairs looked at and the ones that passed the prefilter
+    def search(self, amax, nmax, nmin=3, workers=None, checkpoint=None, block=64, usethreads=False):
+        found, self.checked, self.candidates = search(amax, nmax, nmin, workers, checkpoint, block, usethreads)
+        for a, b, c, n in found:
+            print('{0} = {1} for n = {2}'.format(a**n + b**n, c**n, n))
+
+        return found
+
+
+# Scans every n from nmin to nmax and 1 <= a <= b <= amax for a c with
+# a^n + b^n = c^n. The work is split in tasks of block values of a for one
+# n, run by a pool of workers (processes, threads if usethreads) with at most
+# 2 tasks per worker in flight.
+# Every worker keeps, per n, a table of c^n and of its residues modulo
+# prefilter_modulus, the sums of a row of b are checked against the possible
+# residues all at once with numpy and only the ones left are added as big
+# integers and looked up in a dictionary of c^n (c is never looped over).
+# If checkpoint is the path of a json file the progress is saved there every
+# checkpoint_interval seconds and when the search ends or is interrupted, a
+# search started again with the same checkpoint skips the finished tasks.
+# Returns (found, checked, candidates)
+def search(amax, nmax, nmin=3, workers=None, checkpoint=None, block=64, usethreads=False):
+    if nmin < 3 or nmax < nmin or amax < 1:
+        raise ValueError('{0} is not a valid search range'.format((amax, nmin, nmax)))
+
+    settings = {'amax': amax, 'nmin': nmin, 'nmax': nmax, 'block': block}
+    state = {'settings': settings, 'done': [], 'found': [], 'checked': 0, 'candidates': 0}
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            saved = json.load(f)
+        if saved['settings'] != settings:
+            raise ValueError('{0} is not a checkpoint of this search'.format(checkpoint))
+        state = saved
+
+    # per n, the start every task below is finished (low water mark) and the
+    # starts of the tasks finished above it
+    marks = dict((n, 1) for n in range(nmin, nmax+1))
+    above = dict((n, set()) for n in range(nmin, nmax+1))
+    for n, mark, starts in state['done']:
+        marks[n] = mark
+        above[n].update(starts)
+
+    tasks = ((n, start) for n in range(nmin, nmax+1) for start in range(1, amax+1, block)
+             if start >= marks[n] and start not in above[n])
+
+    workers = workers or os.cpu_count() or 1
+    executor = ThreadPoolExecutor if usethreads else ProcessPoolExecutor
+    with executor(max_workers=workers) as pool:
+        limit = 2 * workers
+        pending = {}
+        saved = time.monotonic()
+
+        try:
+            while True:
+                for n, start in itertools.islice(tasks, limit - len(pending)):
+                    future = pool.submit(_search_block, n, start, min(start + block, amax+1), amax)
+                    pending[future] = (n, start)
+
+                if not pending:
+                    break
+
+                # the tasks that worked are recorded before the error of any
+                # other one finished with them is raised
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                failed = [future for future in finished if future.exception() is not None]
+                for future in finished:
+                    n, start = pending.pop(future)
+                    if future in failed:
+                        continue
+                    found, checked, candidates = future.result()
+
+                    above[n].add(start)
+                    while marks[n] in above[n]:
+                        above[n].remove(marks[n])
+                        marks[n] += block
+
+                    state['found'].extend(found)
+                    state['checked'] += checked
+                    state['candidates'] += candidates
+
+                if failed:
+                    failed[0].result()
+
+                if checkpoint is not None and time.monotonic() - saved >= checkpoint_interval:
+                    _save_checkpoint(state, marks, above, checkpoint)
+                    saved = time.monotonic()
+
+        finally:
+            if checkpoint is not None:
+                _save_checkpoint(state, marks, above, checkpoint)
+
+    found = sorted(tuple(solution) for solution in state['found'])
+    return found, state['checked'], state['candidates']
+
+
+# the tasks done are saved as [n, low water mark, starts above it] for every
+# n with any, so the file stays small however long the search ran
+def _save_checkpoint(state, marks, above, checkpoint):
+    state['done'] = [[n, marks[n], sorted(above[n])] for n in sorted(marks) if marks[n] > 1 or above[n]]
+
+    temp = '{0}.{1}.tmp'.format(checkpoint, os.getpid())
+    with open(temp, 'w') as f:
+        json.dump(state, f)
+    os.replace(temp, checkpoint)
+
+
+# Worker side of search, all the a from start to stop-1 for one n
+def _search_block(n, start, stop, amax):
+    powers, residues, allowed, roots = _power_tables(n, amax)
+    found = []
+    checked = 0
+    candidates = 0
+
+    for a in range(start, stop):
+        # b from a to amax, the residues of the sums are all checked at once
+        sums = (residues[a] + residues[a:amax+1]) % prefilter_modulus
+        passed = numpy.flatnonzero(allowed[sums]) + a
+        checked += amax+1 - a
+        candidates += len(passed)
+
+        power = powers[a]
+        for b in passed.tolist():
+            c = roots.get(power + powers[b])
+            if c is not None:
+                found.append((a, b, c, n))
+
+    return found, checked, candidates
+
+
+# per process cache of the tables of every n
+_tables = {}
+
+
+# For one n: x^n as python ints for x up to the largest possible c
+# (c^n < 2 amax^n), their residues, which residues a c^n can have and the
+# dictionary c^n -> c
+def _power_tables(n, amax):
+    key = (n, amax)
+    if key not in _tables:
+        cmax = int(2 ** (1.0/n) * amax) + 2
+        powers = [x**n for x in range(cmax+1)]
+        residues = numpy.array([pow(x, n, prefilter_modulus) for x in range(cmax+1)], dtype=numpy.int64)
+
+        allowed = numpy.zeros(prefilter_modulus, dtype=bool)
+        allowed[residues[1:]] = True
+
+        roots = dict((powers[c], c) for c in range(1, cmax+1))
+        _tables.clear()
+        _tables[key] = powers, residues, allowed, roots
+
+    return _tables[key]
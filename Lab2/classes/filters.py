@@ -0,0 +1,443 @@
+#!/usr/bin/python3
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from heapq import heapify, heappop, heappush
+from math import fsum
+import itertools
+import mmap
+import os
+import numpy
+
+
+# Start and end (exclusive) index of the window of every sample, arrays of
+# the same length as the data. The edges are the ones of Robot.filterData:
+# with width = (window-1)/2 the first samples use data[0:n+width+1], the last
+# ones data[n-width-1:] and the others data[n-width-1:n+width].
+# start and end only return the bounds of the samples from start to end
+def window_bounds(length, window=1, start=0, end=None):
+    if (window < 1): window = 1
+
+    width = int((window-1) /2)
+    lenData = length-1
+    n = numpy.arange(start, length if end is None else end)
+
+    lo = numpy.where(n <= width, 0, n-width-1)
+    hi = numpy.where(n <= width, numpy.minimum(n+width+1, length),
+                     numpy.where(n >= lenData-width, length, n+width))
+
+    return lo, hi
+
+
+# Mean filter of Robot.filterData in O(n) whatever the window, every mean is
+# the difference of two entries of the running sum of the data.
+# Returns a numpy array
+def running_mean(data, window=1):
+    cumulative = _running_sum(data)
+    lo, hi = window_bounds(len(cumulative)-1, window)
+
+    return (cumulative[hi] - cumulative[lo]) / (hi - lo)
+
+
+# running sum of the data with a leading 0, the sum of data[a:b] is
+# cumulative[b] - cumulative[a]
+def _running_sum(data):
+    data = numpy.asarray(data, dtype=float)
+
+    cumulative = numpy.empty(len(data)+1)
+    cumulative[0] = 0.0
+    numpy.cumsum(data, out=cumulative[1:])
+
+    return cumulative
+
+
+# Median of a sliding window of samples in O(log w) per sample. Samples enter
+# with add() and leave oldest first with pop_oldest().
+# The lower half of the window is kept in a max heap and the upper half in a
+# min heap, both keyed on (value, index) so equal values are still ordered.
+# Samples leaving the window are only dropped once they reach the top of
+# their heap (lazy deletion), the heaps are rebuilt if too many pile up
+class SlidingMedian(object):
+
+    def __init__(self):
+        self.__window = deque()
+        self.__low = []     # (-value, -index), top is the largest of the lower half
+        self.__high = []    # (value, index), top is the smallest of the upper half
+        self.__lowsize = 0
+        self.__highsize = 0
+        self.__first = 0    # index of the oldest sample in the window
+        self.__next = 0
+
+
+    def __len__(self):
+        return len(self.__window)
+
+
+    def add(self, value):
+        key = (value, self.__next)
+        self.__window.append(value)
+        self.__next += 1
+
+        if self.__lowsize == 0 or key <= (-self.__low[0][0], -self.__low[0][1]):
+            heappush(self.__low, (-value, -key[1]))
+            self.__lowsize += 1
+        else:
+            heappush(self.__high, key)
+            self.__highsize += 1
+
+        self.__balance()
+
+
+    def pop_oldest(self):
+        value = self.__window.popleft()
+        key = (value, self.__first)
+        self.__first += 1
+
+        if key <= (-self.__low[0][0], -self.__low[0][1]):
+            self.__lowsize -= 1
+        else:
+            self.__highsize -= 1
+
+        self.__balance()
+        return value
+
+
+    # same as utils.median of the window
+    def median(self):
+        if self.__lowsize > self.__highsize:
+            return -self.__low[0][0]
+
+        return (-self.__low[0][0] + self.__high[0][0])/2
+
+
+    # the lower half holds as many samples as the upper one or one more
+    def __balance(self):
+        self.__prune()
+
+        while self.__lowsize > self.__highsize+1:
+            value, index = heappop(self.__low)
+            heappush(self.__high, (-value, -index))
+            self.__lowsize, self.__highsize = self.__lowsize-1, self.__highsize+1
+            self.__prune()
+
+        while self.__lowsize < self.__highsize:
+            value, index = heappop(self.__high)
+            heappush(self.__low, (-value, -index))
+            self.__lowsize, self.__highsize = self.__lowsize+1, self.__highsize-1
+            self.__prune()
+
+
+    # drops the samples out of the window from the top of the heaps
+    def __prune(self):
+        while self.__low and -self.__low[0][1] < self.__first:
+            heappop(self.__low)
+        while self.__high and self.__high[0][1] < self.__first:
+            heappop(self.__high)
+
+        if len(self.__low) + len(self.__high) > 2*len(self.__window) + 64:
+            self.__low = [entry for entry in self.__low if -entry[1] >= self.__first]
+            self.__high = [entry for entry in self.__high if entry[1] >= self.__first]
+            heapify(self.__low)
+            heapify(self.__high)
+
+
+# Median filter of Robot.filterData in O(n log w), the windows are the same
+# and only move forward so one SlidingMedian follows them.
+# Returns a numpy array
+def sliding_median(data, window=1):
+    values = numpy.asarray(data, dtype=float).tolist()
+    lo, hi = window_bounds(len(values), window)
+
+    return _sliding_median(values, lo, hi)
+
+
+# Windows up to this long are sorted by numpy all at once (a copy of every
+# window, a block of rows at a time), longer ones go through a SlidingMedian
+window_cutoff = 128
+
+
+# median of values[lo[n]:hi[n]] for every n, lo and hi never move back
+def _sliding_median(values, lo, hi):
+    if len(lo) and (hi - lo).max() <= window_cutoff:
+        return _window_median(values, lo, hi)
+
+    filtered = numpy.empty(len(lo))
+    slider = SlidingMedian()
+    start, end = 0, 0
+
+    for n, (a, b) in enumerate(zip(lo.tolist(), hi.tolist())):
+        while end < b:
+            slider.add(values[end])
+            end += 1
+        while start < a:
+            slider.pop_oldest()
+            start += 1
+
+        filtered[n] = slider.median()
+
+    return filtered
+
+
+# Same as _sliding_median with numpy.median over the windows of every length
+# (the ones at the edges are shorter), the middle two are averaged as (a+b)/2
+# like utils.median so the results are the same to the bit
+def _window_median(values, lo, hi, rows=2**20):
+    values = numpy.asarray(values, dtype=float)
+    filtered = numpy.empty(len(lo))
+    lengths = hi - lo
+
+    for length in numpy.unique(lengths).tolist():
+        windows = numpy.lib.stride_tricks.sliding_window_view(values, length)
+        index = numpy.flatnonzero(lengths == length)
+        step = max(rows // length, 1)
+        for start in range(0, len(index), step):
+            block = index[start:start+step]
+            filtered[block] = numpy.median(windows[lo[block]], axis=1)
+
+    return filtered
+
+
+# Statistics the filter bank can compute
+filter_stats = ('mean', 'median')
+
+
+# All the filters of filterData for every window and statistic in one call.
+# The means share one running sum, the medians share nothing: every median
+# row is its own pass over the data (see _sliding_median), which is quicker
+# than moving a structure per window forward together.
+# Returns a 2-D numpy array with a row per (statistic, window), statistics
+# first i.e. with the defaults mean 1, mean 3, ..., median 27
+def filter_bank(data, windows=(1, 3, 9, 27), stats=filter_stats):
+    for stat in stats:
+        if stat not in filter_stats:
+            raise ValueError('{0} is not a valid filter statistic'.format(stat))
+
+    cumulative = _running_sum(data)
+    length = len(cumulative)-1
+    bounds = [window_bounds(length, window) for window in windows]
+    bank = numpy.empty((len(stats) * len(windows), length))
+
+    if 'mean' in stats:
+        row = stats.index('mean') * len(windows)
+        for n, (lo, hi) in enumerate(bounds):
+            bank[row+n] = (cumulative[hi] - cumulative[lo]) / (hi - lo)
+
+    if 'median' in stats:
+        row = stats.index('median') * len(windows)
+        values = numpy.asarray(data, dtype=float).tolist()
+        for n, (lo, hi) in enumerate(bounds):
+            bank[row+n] = _sliding_median(values, lo, hi)
+
+    return bank
+
+
+# Mean or median filter of data (a list, a numpy array, a memory mapped one
+# or the path of a .npy file) split in blocks of samples filtered by a pool of
+# workers, same results to the bit as running_mean and sliding_median.
+# Every block is sent with the halo of samples its windows reach into. Memory
+# mapped data (or a path) is not copied to the workers, they map the part
+# they need, so the data never needs to fit in memory; out can be memory
+# mapped too. At most 2 blocks per worker are in flight.
+# The means are differences of the running sum of all the data, the running
+# sum is carried from block to block so it adds up in the same order as the
+# serial one. Returns out (a new numpy array if not given)
+def filter_chunked(data, window=1, usemedian=False, out=None, block=2**20, workers=None, usethreads=False):
+    if isinstance(data, str):
+        data = numpy.load(data, mmap_mode='r')
+    if not isinstance(data, numpy.ndarray):
+        data = numpy.asarray(data, dtype=float)
+
+    length = len(data)
+    if out is None:
+        out = numpy.empty(length)
+
+    # running sum up to sample position (None before the first sample)
+    position, carry = 0, None
+
+    workers = workers or os.cpu_count() or 1
+    executor = ThreadPoolExecutor if usethreads else ProcessPoolExecutor
+    with executor(max_workers=workers) as pool:
+        blocks = iter(range(0, length, block))
+        limit = 2 * workers
+        pending = {}
+
+        while True:
+            for start in itertools.islice(blocks, limit - len(pending)):
+                end = min(start + block, length)
+                first = int(window_bounds(length, window, start, start+1)[0][0])
+                last = int(window_bounds(length, window, end-1, end)[1][0])
+
+                if not usemedian and first > position:
+                    values = numpy.asarray(data[position:first], dtype=float)
+                    if carry is not None:
+                        values = numpy.concatenate(([carry], values))
+                    carry, position = numpy.cumsum(values)[-1], first
+
+                source = _block_source(data, first, last, usethreads)
+                future = pool.submit(_filter_block, source, first, length, window, usemedian, start, end, carry)
+                pending[future] = start
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                filtered = future.result()
+                out[start:start + len(filtered)] = filtered
+
+    return out
+
+
+# What a worker needs to read data[first:last], the location in the file for
+# a whole memory mapped array, the samples themselves otherwise
+def _block_source(data, first, last, usethreads):
+    if (not usethreads and isinstance(data, numpy.memmap) and isinstance(data.base, mmap.mmap)
+            and data.ndim == 1 and data.flags.c_contiguous):
+        return data.filename, data.dtype.str, data.offset + first * data.itemsize, last - first
+
+    return data[first:last]
+
+
+# Worker side of filter_chunked, filters the samples start to end from the
+# data first onwards. carry is the running sum of the data before first
+def _filter_block(source, first, length, window, usemedian, start, end, carry):
+    if isinstance(source, tuple):
+        filename, dtype, offset, count = source
+        source = numpy.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(count,))
+    values = numpy.asarray(source, dtype=float)
+
+    lo, hi = window_bounds(length, window, start, end)
+    lo, hi = lo - first, hi - first
+
+    if usemedian:
+        return _sliding_median(values.tolist(), lo, hi)
+
+    cumulative = numpy.empty(len(values)+1)
+    if carry is None:
+        cumulative[0] = 0.0
+        numpy.cumsum(values, out=cumulative[1:])
+    else:
+        numpy.cumsum(numpy.concatenate(([carry], values)), out=cumulative)
+
+    return (cumulative[hi] - cumulative[lo]) / (hi - lo)
+
+
+# Online filters, every push(sample) returns the filtered value of the
+# samples seen so far, push_many(samples) does the same for an array of them
+# and returns an array. The window is trailing (the sample and the window-1
+# before it, fewer while the filter fills up) as future samples are not known
+# yet, so the results lag the centered windows of filterData by window/2
+
+# Mean of the last window samples, the running sum is compensated (Neumaier)
+# so it does not drift however long the stream is
+class MeanFilter(object):
+
+    def __init__(self, window=1):
+        if (window < 1): window = 1
+
+        self.window = window
+        self.__samples = deque()
+        self.__sum = 0.0
+        self.__compensation = 0.0
+
+
+    def push(self, sample):
+        sample = float(sample)
+        self.__samples.append(sample)
+        self.__add(sample)
+
+        if len(self.__samples) > self.window:
+            self.__add(-self.__samples.popleft())
+
+        return (self.__sum + self.__compensation) / len(self.__samples)
+
+
+    # vectorized over the running sum of the kept samples and the new ones
+    def push_many(self, samples):
+        samples = numpy.asarray(samples, dtype=float).ravel()
+        kept = len(self.__samples)
+
+        cumulative = numpy.empty(kept + len(samples) + 1)
+        cumulative[0] = 0.0
+        numpy.cumsum(numpy.concatenate((list(self.__samples), samples)), out=cumulative[1:])
+
+        end = numpy.arange(kept+1, len(cumulative))
+        start = numpy.maximum(end - self.window, 0)
+        filtered = (cumulative[end] - cumulative[start]) / (end - start)
+
+        self.__samples.extend(samples[-self.window:].tolist())
+        while len(self.__samples) > self.window:
+            self.__samples.popleft()
+        self.__sum, self.__compensation = fsum(self.__samples), 0.0
+
+        return filtered
+
+
+    def __add(self, value):
+        total = self.__sum + value
+        if abs(self.__sum) >= abs(value):
+            self.__compensation += (self.__sum - total) + value
+        else:
+            self.__compensation += (value - total) + self.__sum
+        self.__sum = total
+
+
+# Median of the last window samples, O(log window) per sample
+class MedianFilter(object):
+
+    def __init__(self, window=1):
+        if (window < 1): window = 1
+
+        self.window = window
+        self.__slider = SlidingMedian()
+
+
+    def push(self, sample):
+        self.__slider.add(float(sample))
+        if len(self.__slider) > self.window:
+            self.__slider.pop_oldest()
+
+        return self.__slider.median()
+
+
+    def push_many(self, samples):
+        return numpy.array([self.push(sample) for sample in numpy.asarray(samples, dtype=float).ravel().tolist()])
+
+
+# Exponential moving average, filtered = filtered + alpha * (sample - filtered)
+# starting from the first sample. alpha can be given as a span instead (the
+# window whose mean has the same average age, alpha = 2/(span+1))
+class EMAFilter(object):
+
+    def __init__(self, alpha=None, span=None):
+        if alpha is None:
+            alpha = 2.0 / (span+1) if span is not None else 0.5
+        if not 0 < alpha <= 1:
+            raise ValueError('{0} is not a valid smoothing factor'.format(alpha))
+
+        self.alpha = alpha
+        self.value = None
+
+
+    def push(self, sample):
+        if self.value is None:
+            self.value = float(sample)
+        else:
+            self.value += self.alpha * (float(sample) - self.value)
+
+        return self.value
+
+
+    # the recurrence is sequential, locals keep the loop cheap
+    def push_many(self, samples):
+        samples = numpy.asarray(samples, dtype=float).ravel().tolist()
+        filtered = numpy.empty(len(samples))
+        alpha, value = self.alpha, self.value
+
+        for n, sample in enumerate(samples):
+            value = sample if value is None else value + alpha * (sample - value)
+            filtered[n] = value
+
+        self.value = value
+        return filtered
@@ -1,21 +1,28 @@
 #!/usr/bin/python3
 
-from classes.sensor import generate_sensor_data, print_sensor_data
+from classes.sensor import generate_sensor_data, generate_sensor_array, write_sensor_data
 import numpy
 import classes.utils as utils
+from classes.stats import RunningStats
+from classes.filters import running_mean, sliding_median, filter_bank, filter_chunked
 
 class Robot(object):
 
     def __init__(self):
         self.data = None
 
-    def getSensorReadings(self, n=1000, noise=0.05):
-        self.data = generate_sensor_data(n, noise)
+    # with a seed (or a numpy Generator) the readings are reproducible
+    def getSensorReadings(self, n=1000, noise=0.05, seed=None):
+        if seed is None:
+            self.data = generate_sensor_data(n, noise)
+        else:
+            self.data = generate_sensor_array(n, noise, seed).tolist()
         return self.data
 
 
-    def printSensorData(self, data, filename):
-        print_sensor_data(data, filename)
+    # format is one of classes.sensor.sensor_formats, text by default
+    def printSensorData(self, data, filename, format='text'):
+        return write_sensor_data(data, filename, format)
 
 
     def null_filter(self, data, width=0):
@@ -26,9 +33,17 @@ class Robot(object):
         return filtered
 
 
-    def filterData(self, data, window=1, usemedian=False, usenumpy=False):
+    # usefast runs the mean filter in O(n) and the median one in O(n log w)
+    # (see classes.filters) instead of going through a slice of the data for
+    # every sample
+    def filterData(self, data, window=1, usemedian=False, usenumpy=False, usefast=False):
         if (window < 1): window = 1
 
+        if usefast == True:
+            if usemedian == True:
+                return sliding_median(data, window).tolist()
+            return running_mean(data, window).tolist()
+
         func = self.__getfilterFunction(usemedian, usenumpy)
         filtered = []
         width = int((window-1) /2)
@@ -52,6 +67,28 @@ class Robot(object):
         return filtered
 
 
+    # Mean and/or median filter of the data for every window in one call,
+    # same results as filterData. Returns a 2-D numpy array, one row per
+    # (statistic, window) with the statistics first
+    def filterBank(self, data, windows=(1, 3, 9, 27), stats=('mean', 'median')):
+        return filter_bank(data, windows, stats)
+
+
+    # filterData for data too big for memory, data can be a memory mapped
+    # numpy array (or the path of a .npy file) that is filtered in blocks by a
+    # pool of processes (threads if usethreads). Returns a numpy array, or out
+    def filterChunked(self, data, window=1, usemedian=False, out=None, block=2**20, workers=None, usethreads=False):
+        return filter_chunked(data, window, usemedian, out, block, workers, usethreads)
+
+
+    # Filters readings as they arrive, one of the online filters of
+    # classes.filters (MeanFilter, MedianFilter, EMAFilter) is pushed every
+    # reading and the filtered values are yielded back
+    def filterStream(self, readings, filter):
+        for reading in readings:
+            yield filter.push(reading)
+
+
     def __getfilterFunction(self, usemedian=False, usenumpy=False):
         if usenumpy == True:
             if usemedian == True:
@@ -72,15 +109,19 @@ class Robot(object):
         # standard deviation, median measurement, the maximum and minimum
         # measurements, and what percentage of measurements are more than one
         # standard deviations from the mean
-        tdata = sorted(data)
-        datapoints = len(data)
-        datamean = utils.mean(data)
-        datamedian = utils.median(data)
+        # one RunningStats pass for everything but the median (selection) and
+        # the fraction within a standard deviation (one vectorized pass)
+        values = numpy.asarray(data, dtype=float)
+        stats = RunningStats().push_many(values)
+
+        datapoints = stats.count
+        datamean = stats.mean
+        datamedian = utils.median(values)
 
-        mindata, maxData = tdata[0], tdata[datapoints-1]
+        mindata, maxData = stats.min, stats.max
 
-        stdDev = numpy.std(data)
-        pctStdDev = utils.percent_within_StdDev(data, stdDev, 1) *100
+        stdDev = stats.std()
+        pctStdDev = utils.percent_within_StdDev(values, stdDev, 1) *100
 
         print('''
          Dataset --> {6}
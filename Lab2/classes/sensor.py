@@ -3,6 +3,9 @@
 
 from math import sin
 from random import gauss
+import os
+import struct
+import numpy
 
 
 # Generates data from a fictional sensor, complete with measurement
@@ -11,10 +14,95 @@ def generate_sensor_data(n=1000, noise=0.05):
     return [sin(x * 0.01) + gauss(0.0, noise) for x in range(n)]
 
 
+# Same sensor as generate_sensor_data as a float64 numpy array. rng is a
+# numpy Generator or a seed for one (a new random one if None), the same seed
+# always gives the same data. start is the time step of the first sample
+def generate_sensor_array(n=1000, noise=0.05, rng=None, start=0):
+    rng = numpy.random.default_rng(rng)
+    return numpy.sin(numpy.arange(start, start+n) * 0.01) + rng.normal(0.0, noise, n)
+
+
+# Yields the sensor data in numpy blocks of chunk samples, n samples in total
+# or forever if n is None. With the same seed the blocks put together are the
+# same as generate_sensor_array(n, noise, seed)
+def generate_sensor_chunks(n=None, noise=0.05, rng=None, chunk=2**20):
+    rng = numpy.random.default_rng(rng)
+    start = 0
+
+    while n is None or start < n:
+        size = chunk if n is None else min(chunk, n-start)
+        yield generate_sensor_array(size, noise, rng, start)
+        start += size
+
+
 # Print some sensor data to a file.
-def print_sensor_data(data, filename):
+# The lines are formatted and written a block at a time, numpy arrays are
+# turned into python floats first so the text is the same as for a list
+def print_sensor_data(data, filename, block=65536):
+    if isinstance(data, numpy.ndarray):
+        data = data.tolist()
+
     with open(filename, 'w') as f:
-        for i in range(len(data)):
-            f.write('{0}\t{1}\n'.format(i, data[i]))
+        for start in range(0, len(data), block):
+            f.write(''.join(map('{0}\t{1}\n'.format, range(start, start+block), data[start:start+block])))
+
+
+# Formats print_sensor_data can write (see write_sensor_data)
+sensor_formats = ('text', 'npy', 'log')
+
+# Append only sensor log: this header then the samples as little endian
+# float64, a block appended at a time. The number of samples comes from the
+# size of the file so appending never rewrites anything
+logHeader = struct.Struct('<4sHH8x')
+logMagic = b'SENS'
+logVersion = 1
+
+
+# Writes the data in one of sensor_formats, text as print_sensor_data, npy
+# as a .npy file and log as a new sensor log. npy and log add their extension
+# to filename. Returns the name of the file written
+def write_sensor_data(data, filename, format='text'):
+    if format == 'text':
+        print_sensor_data(data, filename)
+
+    elif format == 'npy':
+        filename += '.npy'
+        numpy.save(filename, numpy.asarray(data, dtype='<f8'))
+
+    elif format == 'log':
+        filename += '.slog'
+        with open(filename, 'wb') as f:
+            f.write(logHeader.pack(logMagic, logVersion, 8))
+        append_sensor_data(data, filename)
+
+    else:
+        raise ValueError('{0} is not a valid sensor data format'.format(format))
+
+    return filename
+
+
+# Appends a block of samples to a sensor log, the log is created if needed
+def append_sensor_data(data, filename):
+    with open(filename, 'ab') as f:
+        if f.tell() == 0:
+            f.write(logHeader.pack(logMagic, logVersion, 8))
+        numpy.asarray(data, dtype='<f8').tofile(f)
+
+
+# All the samples of a sensor log as a read only memory mapped array, a
+# sample left half written by an interrupted append is ignored
+def read_sensor_log(filename):
+    with open(filename, 'rb') as f:
+        magic, version, itemsize = logHeader.unpack(f.read(logHeader.size))
+        f.seek(0, os.SEEK_END)
+        samples = (f.tell() - logHeader.size) // 8
+
+    if magic != logMagic or version != logVersion or itemsize != 8:
+        raise ValueError('{0} is not a sensor log'.format(filename))
+
+    if samples == 0:
+        return numpy.empty(0)
+
+    return numpy.memmap(filename, dtype='<f8', mode='r', offset=logHeader.size, shape=(samples,))
 
 
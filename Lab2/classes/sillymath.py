@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 
-from math import pi, factorial, sqrt
-import classes.utils as utils
+from math import pi, factorial, sqrt, isqrt, gcd, prod
+from decimal import Context
+import numbers
+import numpy
+
+# Series estimate_pi can use
+pi_series = ('ramanujan', 'chudnovsky')
 
 class SillyMath(object):
 
@@ -35,18 +40,125 @@ class SillyMath(object):
         return a
 
 
-    def estimate_pi(self):
+    # Elementwise gcd of two arrays (or lists, or numbers, broadcast together).
+    # Fixed size integers go through numpy.gcd, anything bigger (python ints
+    # that do not fit in 64 bits end up in object arrays) through math.gcd,
+    # which is already a C Lehmer gcd and beats a binary gcd written in python
+    def gdc_array(self, a, b):
+        a, b = self.__integerArrays(a, b)
+        if a.dtype != object:
+            return numpy.gcd(a, b)
+
+        return numpy.frompyfunc(gcd, 2, 1)(a, b)
+
+
+    def lcm_array(self, a, b):
+        a, b = self.__integerArrays(a, b)
+        if a.dtype != object:
+            return numpy.lcm(a, b)
+
+        return numpy.frompyfunc(lambda x, y: abs(x // gcd(x, y) * y) if x and y else 0, 2, 1)(a, b)
+
+
+    # gcd of all the values, stops as soon as it gets to 1
+    def gdc_reduce(self, values):
+        values, = self.__integerArrays(values)
+        if values.dtype != object:
+            return numpy.gcd.reduce(values.ravel()).item()
+
+        retval = 0
+        for value in values.ravel():
+            retval = gcd(retval, value)
+            if retval == 1:
+                break
+        return retval
+
+
+    # For every modulus, its gcd with the product of all the others (the
+    # factors it shares with any of them), by Bernstein's batch gcd:
+    # the product of all the moduli is built as a tree of pairwise products,
+    # then reduced down the tree modulo the square of every node so each
+    # leaf ends with P mod n^2 and gcd(n, (P mod n^2) / n) is the answer.
+    # Quasi linear in the total size instead of a gcd for every pair.
+    # A zero makes the product of the others 0 for every other modulus
+    # (gcd(n, 0) = n), its own answer is the product of the others
+    def batch_gdc(self, moduli):
+        moduli = [int(n) for n in moduli]
+        if len(moduli) < 2:
+            return [1] * len(moduli)
+
+        zeros = moduli.count(0)
+        if zeros:
+            others = abs(prod(n for n in moduli if n != 0)) if zeros == 1 else 0
+            return [others if n == 0 else abs(n) for n in moduli]
+
+        tree = [moduli]
+        while len(tree[-1]) > 1:
+            level = tree[-1]
+            tree.append([level[n] * level[n+1] if n+1 < len(level) else level[n] for n in range(0, len(level), 2)])
+
+        remainders = tree.pop()
+        while tree:
+            level = tree.pop()
+            remainders = [remainders[n // 2] % (level[n] * level[n]) for n in range(len(level))]
+
+        return [gcd(n, r // n) for n, r in zip(moduli, remainders)]
+
+
+    # the values as numpy integer arrays of one dtype, object arrays of
+    # python ints when they do not all fit in 64 bits. Empty ones are int64
+    # (so the gcd of nothing is 0)
+    def __integerArrays(self, *values):
+        try:
+            arrays = [numpy.asarray(value) for value in values]
+        except OverflowError:
+            arrays = [numpy.asarray(value, dtype=object) for value in values]
+
+        arrays = [array.astype(numpy.int64) if array.size == 0 else array for array in arrays]
+
+        if any(array.dtype.kind not in 'iuO' for array in arrays):
+            raise ValueError('{0} are not valid integers'.format(values))
+
+        if any(array.dtype == object for array in arrays):
+            arrays = [array.astype(object) for array in arrays]
+            if any(not isinstance(value, numbers.Integral) for array in arrays for value in array.ravel()):
+                raise ValueError('{0} are not valid integers'.format(values))
+
+        # numpy has no gcd of signed and unsigned 64 bit integers, int64 if the
+        # unsigned values fit in it, python ints otherwise
+        if set(array.dtype.kind for array in arrays) == set('iu'):
+            fits = all(array.dtype.kind == 'i' or array.size == 0 or array.max() <= numpy.iinfo(numpy.int64).max
+                       for array in arrays)
+            arrays = [array.astype(numpy.int64 if fits else object) for array in arrays]
+
+        return numpy.broadcast_arrays(*arrays) if len(arrays) > 1 else arrays
+
+
+    # Ramanujan's series for 1/pi as a float, or pi to digits significant
+    # digits (a Decimal) with series ramanujan (~8 digits per term) or
+    # chudnovsky (~14 digits per term).
+    # The float version gets every term from the previous one, the ratio
+    # (4k+1)(4k+2)(4k+3)(4k+4) / ((k+1)^4 396^4) replaces the factorials
+    def estimate_pi(self, digits=None, series='ramanujan'):
+        if series not in pi_series:
+            raise ValueError('{0} is not a valid pi series'.format(series))
+
+        if digits is not None:
+            return self.__estimatePiDigits(digits, series)
+        if series == 'chudnovsky':
+            return float(self.__estimatePiDigits(20, series))
+
         SRConst = float((2 * sqrt(2)) / 9801)
         threshold = 1e-15
 
         k = 0
         retVal = 0
         tempVal = 1
+        ratio = 1.0     # (4k)! / (k!^4 396^4k)
         while not (abs(tempVal) < threshold):
-            srn = self.__getSRNumerator(k)
-            srd = self.__getSRDenominator(k)
-            tempVal = SRConst * float(srn/srd)
+            tempVal = SRConst * ratio * (1103 + 26390 * k)
             retVal += tempVal
+            ratio *= (4*k + 1) * (4*k + 2) * (4*k + 3) * (4*k + 4) / ((k + 1)**4 * 396.0**4)
             k += 1
         return float(1 / retVal)
 
@@ -56,11 +168,63 @@ class SillyMath(object):
         return False
 
 
-    def __getSRNumerator(self, k=0):
-        return float(utils.factorial(4*k) * (1103 + 26390 * k))
+    # Sums enough terms of the series with integers only, by binary splitting:
+    # the sum of terms a to b is kept as T/Q and the running product of the
+    # term ratios as P, the halves are computed separately and combined so
+    # the big numbers are multiplied by numbers of the same size
+    def __estimatePiDigits(self, digits, series):
+        if digits < 1:
+            raise ValueError('{0} is not a valid number of digits'.format(digits))
+
+        guard = 10
+        one = 10 ** (digits + guard)
+
+        if series == 'ramanujan':
+            # 1/pi = 2 sqrt(2)/9801 * T/Q
+            P, Q, T = self.__binarySplit(0, digits // 7 + 2, self.__ramanujanTerm)
+            scaled = 9801 * Q * isqrt(2 * one * one) // (4 * T)
+        else:
+            # 1/pi = T / (426880 sqrt(10005) Q)
+            P, Q, T = self.__binarySplit(0, digits // 14 + 2, self.__chudnovskyTerm)
+            scaled = 426880 * Q * isqrt(10005 * one * one) // T
+
+        context = Context(prec=digits)
+        return context.create_decimal(scaled).scaleb(-(digits + guard), context)
+
+
+    # (P, Q, T) of the terms a to b-1
+    def __binarySplit(self, a, b, term):
+        if b - a == 1:
+            return term(a)
+
+        m = (a + b) // 2
+        Pam, Qam, Tam = self.__binarySplit(a, m, term)
+        Pmb, Qmb, Tmb = self.__binarySplit(m, b, term)
+
+        return Pam * Pmb, Qam * Qmb, Tam * Qmb + Pam * Tmb
+
+
+    # ratio of term k to term k-1 as P/Q, and T = P * (1103 + 26390k)
+    def __ramanujanTerm(self, k):
+        if k == 0:
+            P, Q = 1, 1
+        else:
+            P = (4*k - 3) * (4*k - 2) * (4*k - 1) * (4*k)
+            Q = k**4 * 396**4
+
+        return P, Q, P * (1103 + 26390 * k)
+
+
+    # the same for (-1)^k (6k)! (13591409 + 545140134k) / ((3k)! k!^3 640320^3k)
+    def __chudnovskyTerm(self, k):
+        if k == 0:
+            P, Q = 1, 1
+        else:
+            P = (6*k - 5) * (2*k - 1) * (6*k - 1)
+            Q = k**3 * (640320**3 // 24)
 
-    def __getSRDenominator(self, k=0):
-        return float((utils.factorial(k)**4) * (396 ** (4 * k)))
+        T = P * (13591409 + 545140134 * k)
+        return P, Q, -T if k % 2 else T
 
 
 
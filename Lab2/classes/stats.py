@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+
+from math import sqrt
+import numpy
+import classes.utils as utils
+
+
+# Count, mean, variance, minimum and maximum of a stream of samples kept up
+# to date one sample (push) or one block of samples (push_many) at a time,
+# without keeping the samples. The variance is kept as the sum of squared
+# differences from the mean (Welford), partial results of chunks of the same
+# data can be combined with merge.
+# If edges (increasing bin edges) are given the samples are also counted in a
+# histogram, which gives an estimate of the fraction within k standard
+# deviations and of the quantiles of the stream
+class RunningStats(object):
+
+    def __init__(self, edges=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+        self.edges = None if edges is None else numpy.asarray(edges, dtype=float)
+        self.counts = None if edges is None else numpy.zeros(len(self.edges)-1, dtype=numpy.int64)
+        self.under = 0  # samples below the first edge
+        self.over = 0   # samples above the last edge
+
+
+    def push(self, sample):
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (sample - self.mean)
+
+        self.min = sample if self.min is None or sample < self.min else self.min
+        self.max = sample if self.max is None or sample > self.max else self.max
+
+        if self.edges is not None:
+            self.__histogram(numpy.array([sample], dtype=float))
+
+        return self
+
+
+    # the block's own statistics are computed with numpy and merged in
+    def push_many(self, samples):
+        samples = numpy.asarray(samples, dtype=float).ravel()
+        if len(samples) == 0:
+            return self
+
+        block = RunningStats()
+        block.count = len(samples)
+        block.mean = samples.mean()
+        block.m2 = float(numpy.square(samples - block.mean).sum())
+        block.min, block.max = samples.min().item(), samples.max().item()
+        block.mean = block.mean.item()
+
+        self.merge(block)
+
+        if self.edges is not None:
+            self.__histogram(samples)
+
+        return self
+
+
+    # Adds the statistics of other (of other samples of the same stream) to
+    # these ones (Chan et al. parallel variance). Histograms need the same edges
+    def merge(self, other):
+        if other.count == 0:
+            return self
+
+        if self.edges is not None and other.edges is not None:
+            if not numpy.array_equal(self.edges, other.edges):
+                raise ValueError('histograms with different edges can not be merged')
+            self.counts += other.counts
+            self.under += other.under
+            self.over += other.over
+
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+        self.min = other.min if self.min is None or other.min < self.min else self.min
+        self.max = other.max if self.max is None or other.max > self.max else self.max
+
+        return self
+
+
+    # population variance (ddof=0 as numpy.var), ddof=1 for the sample one
+    def variance(self, ddof=0):
+        if self.count - ddof <= 0:
+            return float('nan')
+
+        return self.m2 / (self.count - ddof)
+
+
+    def std(self, ddof=0):
+        return sqrt(self.variance(ddof))
+
+
+    # Estimated fraction of the samples within k (or a list of k) standard
+    # deviations of the mean from the histogram (see utils.histogram_within),
+    # samples out of the edges count as outside
+    def within(self, k=1):
+        if self.edges is None:
+            raise ValueError('no histogram, the RunningStats were created without edges')
+
+        return utils.histogram_within(self.counts, self.edges, self.mean, self.std(), k, self.count)
+
+
+    # Estimated q-th quantile (0 to 1) of the samples from the histogram
+    def quantile(self, q):
+        if self.edges is None:
+            raise ValueError('no histogram, the RunningStats were created without edges')
+
+        cumulative = self.under + numpy.cumsum(self.counts)
+        target = q * self.count
+        n = int(numpy.searchsorted(cumulative, target))
+        if n >= len(self.counts):
+            return self.max
+
+        before = cumulative[n] - self.counts[n]
+        if target <= before:
+            return self.min if n == 0 else self.edges[n]
+
+        return self.edges[n] + (target - before) / self.counts[n] * (self.edges[n+1] - self.edges[n])
+
+
+    def __histogram(self, samples):
+        self.under += int(numpy.count_nonzero(samples < self.edges[0]))
+        self.over += int(numpy.count_nonzero(samples > self.edges[-1]))
+        self.counts += numpy.histogram(samples, self.edges)[0]
+
@@ -1,17 +1,92 @@
 #!/usr/bin/python3
 
 from classes.fermat import Fermat
+import sys, getopt
 
-def main():
+normal_termination = 0
+command_line_syntax_error = 2
+
+helpstring = '''
+mainfermat.py -a <option> -n <option>
+    with no options asks for a, b, c and n and checks them
+    -h prints this help out
+    -a largest a and b to search (turns the search on)
+    -n largest n to search (default 10)
+    -m smallest n to search (default 3)
+    -w worker processes (default one per core)
+    -c checkpoint file, an interrupted search started again with it carries on
+    e.g. ./mainfermat.py -a2000 -n20 -c fermat.json
+    '''
+
+errorstring = '''{0} is not a valid option value. Type ./mainfermat.py -h for help'''
+
+
+def getIntOption(arg, minVal=1):
+    try:
+        retval = int(arg)
+        if retval < minVal:
+            print(errorstring.format(arg))
+            sys.exit(command_line_syntax_error)
+        return retval
+    except ValueError:
+        print(errorstring.format(arg))
+        sys.exit(command_line_syntax_error)
+
+
+def selectSearch(argv):
+    amax, nmax, nmin, workers, checkpoint = None, 10, 3, None, None
+
+    try:
+        opts, args = getopt.getopt(argv, "ha:n:m:w:c:", ["amax=", "nmax=", "nmin=", "workers=", "checkpoint="])
+    except getopt.GetoptError:
+        print(helpstring)
+        sys.exit(command_line_syntax_error)
+
+    for opt, arg in opts:
+        if opt == '-h':
+            print(helpstring)
+            sys.exit(normal_termination)
+
+        elif opt in ("-a", "--amax"):
+            amax = getIntOption(arg)
+
+        elif opt in ("-n", "--nmax"):
+            nmax = getIntOption(arg, 3)
+
+        elif opt in ("-m", "--nmin"):
+            nmin = getIntOption(arg, 3)
+
+        elif opt in ("-w", "--workers"):
+            workers = getIntOption(arg)
+
+        elif opt in ("-c", "--checkpoint"):
+            checkpoint = arg
+
+    return amax, nmax, nmin, workers, checkpoint
+
+
+def main(argv):
     fermat = Fermat()
+    amax, nmax, nmin, workers, checkpoint = selectSearch(argv)
+
+    if amax is None:
+        a = fermat.getInput('a')
+        b = fermat.getInput('b')
+        c = fermat.getInput('c')
+        n = fermat.getInput('n')
+
+        print(fermat.check_fermat(a, b, c, n))
 
-    a = fermat.getInput('a')
-    b = fermat.getInput('b')
-    c = fermat.getInput('c')
-    n = fermat.getInput('n')
+    else:
+        try:
+            found = fermat.search(amax, nmax, nmin, workers, checkpoint)
+            print('{0} pairs checked, {1} past the prefilter for n = {2} to {3}, a and b up to {4}'.format(
+                fermat.checked, fermat.candidates, nmin, nmax, amax))
+            print(fermat.INCORRECT if found else fermat.CORRECT)
 
-    print(fermat.check_fermat(a, b, c, n))
+        except Exception as ex:
+            print(ex)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 from classes.robot import Robot
+from classes.sensor import sensor_formats
 import matplotlib.pyplot as plt
 import sys, getopt
 
@@ -8,10 +9,12 @@ normal_termination = 0
 command_line_syntax_error = 2
 
 helpstring = '''
-mainfilter.py -e <option> -n <option>
+mainfilter.py -e <option> -n <option> -f <option>
     -h prints this help out
     -e number of epochs (default 1000)
     -n gaussian noise (default 0.25)
+    -f format of the saved data, text (default), npy or log
+       npy files load with numpy.load, log files with classes.sensor.read_sensor_log
     '''
 
 errorstring = '''{0} is not a valid option value. Type ./mainfilter.py -h for help'''
@@ -21,12 +24,13 @@ def selectGaussianNoise(argv):
 
     retNoise = 0.25
     retEpochs = 1000
+    retFormat = 'text'
     # if no argument then runs all the simulations and uses matplotlib
     if len(argv) < 1:
-        return retNoise, retEpochs
+        return retNoise, retEpochs, retFormat
     else: #parses the arguments
         try:
-            opts, args = getopt.getopt(argv, "hn:e:", ["noise=", "epochs="])
+            opts, args = getopt.getopt(argv, "hn:e:f:", ["noise=", "epochs=", "format="])
         except getopt.GetoptError:
             print(helpstring)
             sys.exit(command_line_syntax_error)
@@ -57,16 +61,22 @@ def selectGaussianNoise(argv):
                     print(errorstring.format(arg))
                     sys.exit(command_line_syntax_error)
 
-    return retNoise,retEpochs
+            elif opt in ("-f", "--format"):
+                if arg not in sensor_formats:
+                    print(errorstring.format(arg))
+                    sys.exit(command_line_syntax_error)
+                retFormat = arg
+
+    return retNoise,retEpochs,retFormat
 
 
 def main(args):
     filters = [1, 3, 9, 27]
-    gnoise, epochs = selectGaussianNoise(args)
+    gnoise, epochs, fileformat = selectGaussianNoise(args)
     sillyBot = Robot()
 
     data = sillyBot.getSensorReadings(epochs, gnoise)
-    sillyBot.printSensorData(data, 'unfiltered')
+    sillyBot.printSensorData(data, 'unfiltered', fileformat)
 
     fig, axes = plt.subplots(nrows=4, ncols=5, sharex=True, sharey=True)
 
@@ -74,12 +84,15 @@ def main(args):
     axes[0, 0].plot(data)
     axes[0, 0].set_title('Unfiltered')
 
+    # every mean and median filter in one pass, means first
+    bank = sillyBot.filterBank(data, filters)
+
     idx=1
     for n in filters:
-        meandata = sillyBot.filterData(data, n, usemedian=False, usenumpy=False)
-        mediandata = sillyBot.filterData(data, n, usemedian=True, usenumpy=False)
-        sillyBot.printSensorData(meandata, 'mean_{0}'.format(n))
-        sillyBot.printSensorData(mediandata, 'median_{0}'.format(n))
+        meandata = bank[idx-1].tolist()
+        mediandata = bank[len(filters)+idx-1].tolist()
+        sillyBot.printSensorData(meandata, 'mean_{0}'.format(n), fileformat)
+        sillyBot.printSensorData(mediandata, 'median_{0}'.format(n), fileformat)
         sillyBot.printStatistics(meandata, 'mean_{0}'.format(n))
         sillyBot.printStatistics(mediandata, 'median_{0}'.format(n))
 
@@ -98,9 +111,6 @@ def main(args):
 
         idx += 1
 
-        sillyBot.printSensorData(meandata, 'mean_{0}'.format(n))
-        sillyBot.printSensorData(mediandata, 'median_{0}'.format(n))
-
 
     plt.show()
 
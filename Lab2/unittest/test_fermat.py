@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+import tempfile
+from unittest import TestCase, mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.fermat import Fermat, search, _search_block
+
+
+class TestFermat(TestCase):
+    def test_check_fermat(self):
+        fermat = Fermat()
+        self.assertEqual(fermat.check_fermat(3, 4, 5, 3), Fermat.CORRECT)
+        self.assertEqual(fermat.check_fermat(3, 4, 5, 2), Fermat.CORRECT)
+
+    def test_search_block(self):
+        # n = 2 has plenty of solutions to check the tables and the prefilter with
+        found, checked, candidates = _search_block(2, 1, 51, 50)
+        expected = [(a, b, c, 2) for a in range(1, 51) for b in range(a, 51) for c in range(b, 72) if a*a + b*b == c*c]
+        self.assertEqual(sorted(found), expected)
+        self.assertEqual(checked, 50 * 51 // 2)
+        self.assertTrue(len(expected) <= candidates < checked)
+
+    def test_search(self):
+        found, checked, candidates = search(200, 6, workers=2, block=16, usethreads=True)
+        self.assertEqual(found, [])
+        self.assertEqual(checked, 4 * 200 * 201 // 2)
+        self.assertRaises(ValueError, search, 200, 6, 2)
+
+    def test_search_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'fermat.json')
+            everything = search(100, 5, workers=2, block=10, usethreads=True)
+
+            # a search interrupted after a few tasks, for n = 3 the ones
+            # starting at 1 and 11 (below the mark) and 41
+            with open(checkpoint, 'w') as f:
+                json.dump({'settings': {'amax': 100, 'nmin': 3, 'nmax': 5, 'block': 10},
+                           'done': [[3, 21, [41]]], 'found': [], 'checked': 1000, 'candidates': 0}, f)
+            found, checked, candidates = search(100, 5, workers=2, block=10, checkpoint=checkpoint, usethreads=True)
+            skipped = sum(_search_block(3, start, start+10, 100)[1] for start in [1, 11, 41])
+            self.assertEqual(checked, everything[1] - skipped + 1000)
+
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)['done'], [[3, 101, []], [4, 101, []], [5, 101, []]])
+            self.assertEqual(search(100, 5, block=10, checkpoint=checkpoint, usethreads=True)[1], checked)
+            self.assertRaises(ValueError, search, 100, 6, 3, 1, checkpoint)
+
+    def test_search_interrupted(self):
+        everything = search(100, 5, workers=1, block=10, usethreads=True)
+
+        # the first task of n = 4 fails, the tasks finished before it are saved
+        def failing(n, start, stop, amax):
+            if (n, start) == (4, 1):
+                raise RuntimeError('interrupted')
+            return _search_block(n, start, stop, amax)
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'fermat.json')
+            with mock.patch('classes.fermat._search_block', failing):
+                self.assertRaises(RuntimeError, search, 100, 5, 3, 1, checkpoint, 10, True)
+
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)['done'][0], [3, 101, []])
+            self.assertEqual(search(100, 5, 3, 1, checkpoint, 10, True), everything)
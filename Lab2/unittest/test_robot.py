@@ -1,5 +1,145 @@
+import os
+import tempfile
+import sys
 from unittest import TestCase
+from random import gauss, seed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.robot import Robot
+from classes.filters import window_bounds, SlidingMedian, MeanFilter, MedianFilter, EMAFilter, _window_median
+from classes.utils import median
+from math import fsum
+import numpy
 
 
 class TestRobot(TestCase):
+    def setUp(self):
+        seed(42)
+        self.robot = Robot()
+        self.data = self.robot.getSensorReadings(500, 0.25)
+
     def test_filterData(self):
+        filtered = self.robot.filterData([1.0, 2.0, 3.0, 4.0, 5.0], 3)
+        self.assertEqual(filtered, [1.5, 2.0, 2.0, 3.5, 4.0])
+
+    def test_window_bounds(self):
+        data = list(range(50))
+        for window in [0, 1, 2, 3, 8, 9, 27, 49, 50, 51, 120]:
+            lo, hi = window_bounds(len(data), window)
+            width = int((max(window, 1)-1) /2)
+            for n in range(len(data)):
+                if n <= width:
+                    expected = data[0:n+1] + data[n+1:n+width+1]
+                elif n >= len(data)-1-width:
+                    expected = data[n-width-1:]
+                else:
+                    expected = data[n-width-1:n+width]
+                self.assertEqual(data[lo[n]:hi[n]], expected, (window, n))
+
+    def test_filterData_fast_mean(self):
+        for window in [1, 3, 9, 27, 400, 1000]:
+            slow = self.robot.filterData(self.data, window)
+            fast = self.robot.filterData(self.data, window, usefast=True)
+            self.assertEqual(len(slow), len(fast))
+            for a, b in zip(slow, fast):
+                self.assertAlmostEqual(a, b, places=10)
+
+    def test_filterData_fast_short(self):
+        for data in [[], [gauss(0, 1)], [gauss(0, 1) for n in range(4)]]:
+            for window in [1, 3, 9]:
+                slow = self.robot.filterData(data, window)
+                fast = self.robot.filterData(data, window, usefast=True)
+                self.assertEqual(len(slow), len(fast))
+                for a, b in zip(slow, fast):
+                    self.assertAlmostEqual(a, b, places=12)
+
+    def test_filterData_fast_median(self):
+        # rounded data has plenty of equal values
+        for data in [self.data, [round(x, 1) for x in self.data]]:
+            for window in [1, 2, 3, 9, 27, 400, 1000]:
+                slow = self.robot.filterData(data, window, usemedian=True)
+                fast = self.robot.filterData(data, window, usemedian=True, usefast=True)
+                self.assertEqual(slow, fast)
+
+    def test_window_median(self):
+        data = [round(x, 1) for x in self.data]
+        for window in [2, 27, 200, 1000]:
+            lo, hi = window_bounds(len(data), window)
+            self.assertEqual(_window_median(data, lo, hi, rows=100).tolist(),
+                             self.robot.filterData(data, window, usemedian=True))
+
+    def test_sliding_median(self):
+        slider = SlidingMedian()
+        window = []
+        for n in range(300):
+            value = round(gauss(0, 1), 1)
+            slider.add(value)
+            window.append(value)
+            if n % 3 == 0:
+                self.assertEqual(slider.pop_oldest(), window.pop(0))
+            self.assertEqual(len(slider), len(window))
+            if window:
+                self.assertEqual(slider.median(), median(window))
+
+    def test_online_filters(self):
+        data = [round(x, 2) for x in self.data]
+        for window in [1, 4, 9, 50]:
+            meanfilter, medianfilter = MeanFilter(window), MedianFilter(window)
+            for n, reading in enumerate(data):
+                trailing = data[max(n+1-window, 0):n+1]
+                self.assertAlmostEqual(meanfilter.push(reading), fsum(trailing) / len(trailing), places=12)
+                self.assertEqual(medianfilter.push(reading), median(trailing))
+
+    def test_online_push_many(self):
+        for make in [lambda: MeanFilter(9), lambda: MedianFilter(9), lambda: EMAFilter(span=9)]:
+            single, many = make(), make()
+            pushed = [single.push(reading) for reading in self.data]
+            # in uneven pieces so the state carries between the calls
+            batched = numpy.concatenate([many.push_many(self.data[a:b]) for a, b in [(0, 3), (3, 3), (3, 140), (140, 500)]])
+            for a, b in zip(pushed, batched):
+                self.assertAlmostEqual(a, b, places=12)
+
+    def test_filterStream(self):
+        ema = EMAFilter(alpha=0.5)
+        self.assertEqual(list(self.robot.filterStream(iter([1.0, 3.0, 3.0]), ema)), [1.0, 2.0, 2.5])
+        self.assertRaises(ValueError, EMAFilter, 0)
+
+    def test_filterBank(self):
+        windows = [1, 3, 9, 27, 1000]
+        bank = self.robot.filterBank(self.data, windows)
+        self.assertEqual(bank.shape, (2 * len(windows), len(self.data)))
+        for n, window in enumerate(windows):
+            mean = self.robot.filterData(self.data, window)
+            for a, b in zip(mean, bank[n]):
+                self.assertAlmostEqual(a, b, places=10)
+            self.assertEqual(self.robot.filterData(self.data, window, usemedian=True), bank[len(windows) + n].tolist())
+
+        medians = self.robot.filterBank(self.data, windows, stats=('median',))
+        self.assertEqual(medians.tolist(), bank[len(windows):].tolist())
+        self.assertRaises(ValueError, self.robot.filterBank, self.data, windows, ('mode',))
+
+    def test_filterChunked(self):
+        data = numpy.array(self.data) * 1000
+        for window in [1, 4, 27, 301]:
+            for usemedian in [False, True]:
+                serial = self.robot.filterData(data, window, usemedian=usemedian, usefast=True)
+                for block in [1, 7, 100, 1000]:
+                    chunked = self.robot.filterChunked(data, window, usemedian, block=block, workers=2, usethreads=True)
+                    self.assertEqual(serial, chunked.tolist(), (window, usemedian, block))
+
+    def test_filterChunked_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.npy')
+            numpy.save(path, numpy.array(self.data))
+            out = numpy.lib.format.open_memmap(os.path.join(directory, 'out.npy'), mode='w+', shape=(len(self.data),))
+            for usemedian in [False, True]:
+                serial = self.robot.filterData(self.data, 9, usemedian=usemedian, usefast=True)
+                self.robot.filterChunked(path, 9, usemedian, out=out, block=64, workers=2)
+                self.assertEqual(serial, out.tolist())
+            del out
+
+    def test_getSensorReadings_seed(self):
+        readings = self.robot.getSensorReadings(100, 0.25, seed=5)
+        self.assertIsInstance(readings, list)
+        self.assertEqual(readings, Robot().getSensorReadings(100, 0.25, seed=5))
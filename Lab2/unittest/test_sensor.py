@@ -0,0 +1,76 @@
+import os
+import sys
+from itertools import islice
+from math import sin
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.sensor import generate_sensor_array, generate_sensor_chunks, generate_sensor_data
+from classes.sensor import print_sensor_data, write_sensor_data, append_sensor_data, read_sensor_log
+
+
+class TestSensor(TestCase):
+    def test_generate_sensor_array(self):
+        data = generate_sensor_array(1000, 0.05, 7)
+        self.assertEqual(data.dtype, numpy.float64)
+        self.assertEqual(data.shape, (1000,))
+        self.assertTrue(numpy.array_equal(data, generate_sensor_array(1000, 0.05, 7)))
+        self.assertFalse(numpy.array_equal(data, generate_sensor_array(1000, 0.05, 8)))
+
+        clean = generate_sensor_array(1000, 0.0, 7)
+        for x in [0, 1, 500, 999]:
+            self.assertAlmostEqual(clean[x], sin(x * 0.01), places=14)
+
+    def test_generate_sensor_chunks(self):
+        whole = generate_sensor_array(10000, 0.25, 3)
+        chunks = list(generate_sensor_chunks(10000, 0.25, 3, chunk=999))
+        self.assertEqual([len(chunk) for chunk in chunks], [999] * 10 + [10])
+        self.assertTrue(numpy.array_equal(numpy.concatenate(chunks), whole))
+
+        endless = generate_sensor_chunks(None, 0.25, numpy.random.default_rng(3), chunk=1000)
+        self.assertTrue(numpy.array_equal(numpy.concatenate(list(islice(endless, 10))), whole))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_print_sensor_data(self):
+        data = generate_sensor_data(1000, 0.25) + [1, 2]
+        print_sensor_data(data, self.path('list'), block=64)
+        with open(self.path('list')) as f:
+            self.assertEqual(f.read(), ''.join('{0}\t{1}\n'.format(i, data[i]) for i in range(len(data))))
+
+        print_sensor_data(numpy.array(data[:-2]), self.path('array'))
+        with open(self.path('list')) as f, open(self.path('array')) as g:
+            self.assertEqual(f.read().splitlines()[:-2], g.read().splitlines())
+
+    def test_write_sensor_data(self):
+        data = generate_sensor_array(1000, 0.25, 1)
+        self.assertTrue(numpy.array_equal(numpy.load(write_sensor_data(data, self.path('data'), 'npy')), data))
+        self.assertTrue(numpy.array_equal(read_sensor_log(write_sensor_data(data, self.path('data'), 'log')), data))
+        self.assertRaises(ValueError, write_sensor_data, data, self.path('data'), 'csv')
+
+    def test_sensor_log(self):
+        log = self.path('stream.slog')
+        chunks = list(generate_sensor_chunks(5000, 0.25, 2, chunk=700))
+        for chunk in chunks:
+            append_sensor_data(chunk, log)
+        self.assertTrue(numpy.array_equal(read_sensor_log(log), numpy.concatenate(chunks)))
+
+        # half a sample from an interrupted append
+        with open(log, 'ab') as f:
+            f.write(b'1234')
+        self.assertEqual(len(read_sensor_log(log)), 5000)
+
+        with open(self.path('bad'), 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, read_sensor_log, self.path('bad'))
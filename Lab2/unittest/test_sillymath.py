@@ -0,0 +1,77 @@
+import os
+import sys
+from decimal import Context, Decimal
+from math import pi, gcd, prod
+import random
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.sillymath import SillyMath
+
+pi_100 = ('3.141592653589793238462643383279502884197169399375105820974944'
+          '5923078164062862089986280348253421170679')
+
+
+class TestSillyMath(TestCase):
+    def setUp(self):
+        self.silly = SillyMath()
+
+    def test_estimate_pi(self):
+        self.assertEqual(self.silly.estimate_pi(), pi)
+        self.assertTrue(self.silly.compare_pi(self.silly.estimate_pi()))
+        self.assertEqual(self.silly.estimate_pi(series='chudnovsky'), pi)
+        self.assertRaises(ValueError, self.silly.estimate_pi, None, 'leibniz')
+
+    def test_estimate_pi_digits(self):
+        for series in ['ramanujan', 'chudnovsky']:
+            for digits in [1, 2, 15, 50, 99]:
+                estimate = self.silly.estimate_pi(digits, series)
+                self.assertIsInstance(estimate, Decimal)
+                self.assertEqual(str(estimate), str(Context(prec=digits).create_decimal(pi_100)))
+        self.assertEqual(self.silly.estimate_pi(3000), self.silly.estimate_pi(3000, 'chudnovsky'))
+        self.assertRaises(ValueError, self.silly.estimate_pi, 0)
+
+    def test_gdc_array(self):
+        a = numpy.array([12, 18, 0, 7, -8])
+        b = numpy.array([8, 27, 5, 13, 12])
+        self.assertEqual(self.silly.gdc_array(a, b).tolist(), [gcd(x, y) for x, y in zip(a.tolist(), b.tolist())])
+        self.assertEqual(self.silly.lcm_array(a, b).tolist(), [24, 54, 0, 91, 24])
+        self.assertEqual(self.silly.gdc_array(12, [8, 9]).tolist(), [4, 3])
+        self.assertRaises(ValueError, self.silly.gdc_array, [1.5], [2])
+
+    def test_gdc_array_big(self):
+        a = [2**100 * 3, 2**90 * 9, 5]
+        b = [2**70, 27, 10]
+        self.assertEqual(list(self.silly.gdc_array(a, b)), [gcd(x, y) for x, y in zip(a, b)])
+        self.assertEqual(list(self.silly.lcm_array(a, b)), [x * y // gcd(x, y) for x, y in zip(a, b)])
+
+    def test_gdc_reduce(self):
+        self.assertEqual(self.silly.gdc_reduce([12, 18, 30]), 6)
+        self.assertEqual(self.silly.gdc_reduce(numpy.array([7, 14, 5])), 1)
+        self.assertEqual(self.silly.gdc_reduce([2**80, 2**70 * 3]), 2**70)
+        self.assertEqual(self.silly.gdc_reduce([]), 0)
+        self.assertEqual(self.silly.gdc_reduce(numpy.array([], dtype=numpy.uint64)), 0)
+
+    def test_gdc_mixed_dtypes(self):
+        unsigned = numpy.array([12, 2**63 + 6], dtype=numpy.uint64)
+        signed = numpy.array([-18, 4], dtype=numpy.int64)
+        self.assertEqual(self.silly.gdc_array(unsigned[:1], signed[:1]).tolist(), [6])
+        self.assertEqual(self.silly.gdc_array(unsigned, signed).tolist(), [6, 2])
+        self.assertEqual(self.silly.lcm_array(unsigned[:1], signed[:1]).tolist(), [36])
+
+    def test_batch_gdc(self):
+        primes = [1000003, 1000033, 1000037, 1000039, 1000081, 1000099, 2**61 - 1, 2**89 - 1]
+        random.seed(5)
+        moduli = [random.choice(primes) * random.choice(primes) for n in range(37)]
+        expected = [gcd(n, prod(moduli[:i] + moduli[i+1:])) for i, n in enumerate(moduli)]
+        self.assertEqual(self.silly.batch_gdc(moduli), expected)
+        self.assertEqual(self.silly.batch_gdc([15, 77, 221]), [1, 1, 1])
+        self.assertEqual(self.silly.batch_gdc([15]), [1])
+
+        # with zeros, still gcd(n, product of the others)
+        for moduli in [[6, 0, 10], [0, 0, 7], [0, 9]]:
+            expected = [gcd(n, prod(moduli[:i] + moduli[i+1:])) for i, n in enumerate(moduli)]
+            self.assertEqual(self.silly.batch_gdc(moduli), expected)
@@ -0,0 +1,61 @@
+import os
+import sys
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.sensor import generate_sensor_array
+from classes.stats import RunningStats
+
+
+class TestStats(TestCase):
+    def setUp(self):
+        self.data = generate_sensor_array(10000, 0.25, 11)
+
+    def assertMatches(self, stats, data):
+        self.assertEqual(stats.count, len(data))
+        self.assertAlmostEqual(stats.mean, numpy.mean(data), places=12)
+        self.assertAlmostEqual(stats.std(), numpy.std(data), places=12)
+        self.assertAlmostEqual(stats.std(1), numpy.std(data, ddof=1), places=12)
+        self.assertEqual(stats.min, data.min())
+        self.assertEqual(stats.max, data.max())
+
+    def test_push(self):
+        stats = RunningStats()
+        for sample in self.data[:1000].tolist():
+            stats.push(sample)
+        self.assertMatches(stats, self.data[:1000])
+
+    def test_push_many(self):
+        self.assertMatches(RunningStats().push_many(self.data), self.data)
+        self.assertEqual(RunningStats().push_many(self.data).mean, self.data.mean())
+
+    def test_merge(self):
+        chunks = [RunningStats().push_many(self.data[a:a+1234]) for a in range(0, len(self.data), 1234)]
+        total = RunningStats()
+        for chunk in chunks:
+            total.merge(chunk)
+        self.assertMatches(total, self.data)
+        self.assertMatches(RunningStats().merge(RunningStats()).push_many(self.data), self.data)
+
+    def test_histogram(self):
+        edges = numpy.linspace(-3, 3, 601)
+        stats = RunningStats(edges)
+        for a in range(0, len(self.data), 999):
+            stats.push_many(self.data[a:a+999])
+        stats.push(10.0)
+        data = numpy.append(self.data, 10.0)
+
+        self.assertEqual(stats.counts.sum() + stats.under + stats.over, len(data))
+        self.assertEqual(stats.over, 1)
+        for k in [0.5, 1, 2]:
+            exact = numpy.count_nonzero(abs(data - stats.mean) < k * stats.std()) / len(data)
+            self.assertAlmostEqual(stats.within(k), exact, places=2)
+        for q in [0.1, 0.5, 0.9]:
+            self.assertAlmostEqual(stats.quantile(q), numpy.quantile(data, q), places=1)
+
+        self.assertRaises(ValueError, RunningStats().within, 1)
+        self.assertRaises(ValueError, stats.merge, RunningStats(numpy.linspace(0, 1, 3)).push(0.5))
+
@@ -0,0 +1,97 @@
+import os
+import math
+import sys
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.sensor import generate_sensor_array
+from classes.utils import median, quantile, quantiles, percent_within_StdDev, histogram_within
+from classes.utils import factorial, log_factorial
+
+
+# the sorting median the selection one replaced
+def sorted_median(data):
+    temp = sorted(data)
+    index = int((len(data)-1)/2)
+    if len(data) % 2:
+        return temp[index]
+    return (temp[index] + temp[index+1])/2
+
+
+class TestUtils(TestCase):
+    def setUp(self):
+        self.data = generate_sensor_array(5001, 0.25, 13)
+
+    def test_median(self):
+        for n in [1, 2, 3, 10, 33, 1000, 1024, 1025, 1026, 5001]:
+            data = self.data[:n].tolist()
+            self.assertEqual(median(data), sorted_median(data))
+            self.assertEqual(median(self.data[:n]), sorted_median(data))
+            self.assertIsInstance(median(self.data[:n]), float)
+
+        integers = [int(x * 100) for x in self.data]
+        self.assertEqual(median(integers), sorted_median(integers))
+        self.assertEqual(median(integers[:-1]), sorted_median(integers[:-1]))
+        self.assertEqual(median(['b', 'c', 'a']), 'b')
+        self.assertEqual(median([2**70, 1, 3]), 3)
+
+    def test_quantile(self):
+        for n in [1, 2, 7, 100, 5001]:
+            for q in [0, 0.1, 0.25, 0.5, 0.9, 1]:
+                self.assertAlmostEqual(quantile(self.data[:n], q), numpy.quantile(self.data[:n], q), places=12)
+        self.assertEqual(quantile(self.data, 0.5), median(self.data))
+        self.assertRaises(ValueError, quantile, self.data, 1.5)
+
+    def test_quantiles(self):
+        qs = [0.05, 0.25, 0.5, 0.75, 0.95]
+        for a, b in zip(quantiles(self.data, qs), numpy.quantile(self.data, qs)):
+            self.assertAlmostEqual(a, b, places=12)
+        self.assertEqual(quantiles(self.data.tolist(), qs), quantiles(self.data, qs))
+
+    def test_percent_within_StdDev(self):
+        data = self.data.tolist()
+        stddev = numpy.std(data)
+        meanval = sum(data)/len(data)
+        for k in [0, 0.5, 1, 2, 3]:
+            looped = len([n for n in data if meanval - stddev*k < n < meanval + stddev*k]) / len(data)
+            self.assertEqual(percent_within_StdDev(data, stddev, k), looped)
+
+        multipliers = [0.5, 1, 2, 3]
+        together = percent_within_StdDev(self.data, stddev, multipliers)
+        self.assertEqual(together, [percent_within_StdDev(self.data, stddev, k) for k in multipliers])
+        self.assertEqual(percent_within_StdDev(data, stddev, multipliers), [percent_within_StdDev(data, stddev, k) for k in multipliers])
+
+        # crossed bounds hold nothing on both paths
+        self.assertEqual(percent_within_StdDev(data, stddev, -1), 0.0)
+        self.assertEqual(percent_within_StdDev(data, stddev, [-1, -0.5, 1]), [0.0, 0.0, percent_within_StdDev(data, stddev, 1)])
+
+    def test_histogram_within(self):
+        stddev = numpy.std(self.data)
+        meanval = numpy.mean(self.data)
+        edges = numpy.linspace(-2, 2, 801)
+        counts = numpy.histogram(self.data, edges)[0]
+
+        exact = percent_within_StdDev(self.data, stddev, [1, 2])
+        approximate = histogram_within(counts, edges, meanval, stddev, [1, 2], len(self.data))
+        for a, b in zip(exact, approximate):
+            self.assertAlmostEqual(a, b, places=2)
+        self.assertEqual(histogram_within(counts, edges, meanval, stddev, 1, len(self.data)), approximate[0])
+
+    def test_factorial(self):
+        for n in list(range(0, 40)) + [510, 511, 512, 513, 1000, 3001]:
+            self.assertEqual(factorial(n), math.factorial(n))
+        self.assertEqual(factorial(5.0), 120)
+        self.assertRaises(ValueError, factorial, -1)
+        self.assertRaises(ValueError, factorial, 2.5)
+
+    def test_log_factorial(self):
+        n = numpy.array([0, 1, 2, 10, 511, 512, 513, 10**4, 10**8])
+        expected = [math.lgamma(x + 1) for x in n.tolist()]
+        for a, b in zip(log_factorial(n), expected):
+            self.assertAlmostEqual(a / b if b else a, 1.0 if b else 0.0, places=14)
+        self.assertEqual(log_factorial(10), math.lgamma(11))
+        self.assertIsInstance(log_factorial(10), float)
+        self.assertRaises(ValueError, log_factorial, [1, -2])
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import numpy
+from classes.smd import analytic_response
+from classes.sweep import random_parameters
+
+
+# Results of a monte carlo run, every per timestep array has one entry per time
+class MonteCarloResult(object):
+    def __init__(self, samples, times, percentiles, envelopes, mean, std, minimum, maximum,
+                 settling_edges, settling_counts, unsettled, overshoot_edges, overshoot_counts):
+        self.samples = samples
+        self.times = times
+        self.percentiles = percentiles
+        self.envelopes = envelopes                  # (percentiles, T) displacement percentiles
+        self.mean = mean
+        self.std = std
+        self.minimum = minimum
+        self.maximum = maximum
+        self.settling_edges = settling_edges        # histogram of the settling times, 0 to t
+        self.settling_counts = settling_counts
+        self.unsettled = unsettled                  # samples that never settle
+        self.overshoot_edges = overshoot_edges      # histogram of the peak overshoot, as a fraction of the peak
+        self.overshoot_counts = overshoot_counts
+
+
+# bytes of temporaries per sample and timestep while a batch is simulated,
+# binned and its settling times found (measured, about a dozen float64 arrays)
+sample_bytes = 128
+
+
+# Samples n systems from the gerryspringer ranges (any range can be overridden
+# as in sweep.random_parameters) all simulated for the same t and dt, and
+# collects the displacement statistics over time.
+# The systems are drawn and simulated batch at a time with the closed form
+# solution and folded into running sums and a histogram of bins bins per
+# timestep, so the memory used never depends on n. It is kept within about
+# memory bytes: the histograms get at most a quarter of it (bins is lowered
+# for very long runs) and batch, unless given, is sized to use the rest.
+# Percentiles are read from the histograms (accurate to a fraction of a bin).
+# The settling time is when the displacement stays within settle times the
+# peak displacement, the overshoot is the largest swing to the other side of
+# the equilibrium from the peak, both are counted in histograms of
+# summary_bins bins
+def monte_carlo(n, t=100.0, dt=0.01, percentiles=(5, 25, 50, 75, 95), batch=None, bins=256,
+                settle=0.02, seed=None, summary_bins=50, memory=2**29, **ranges):
+    times = numpy.arange(0.0, t, dt)
+
+    # the counts and the bincount of every batch added to them, int64 each
+    bins = max(2, min(bins, memory // (4 * 16 * len(times))))
+    if batch is None:
+        batch = max(1, (memory - 16 * bins * len(times)) // (sample_bytes * len(times)))
+
+    # the parameters are drawn twice from the same seed sequence, first to
+    # find the histogram range then to simulate them
+    sequence = numpy.random.SeedSequence(seed)
+
+    # the energy never grows, so no displacement is larger than the one
+    # holding all the initial energy as spring energy (if every system is at
+    # rest any range holds the zeros)
+    bound = 0.0
+    for mass, spring, damp, x, x_dot in _batches(n, batch, sequence, t, dt, ranges):
+        bound = max(bound, numpy.sqrt(x ** 2 + mass * x_dot ** 2 / spring).max())
+    bound = bound or 1.0
+    width = 2 * bound / bins
+    offsets = numpy.arange(len(times)) * bins
+
+    counts = numpy.zeros(len(times) * bins, dtype=numpy.int64)
+    total = numpy.zeros(len(times))
+    squares = numpy.zeros(len(times))
+    minimum = numpy.full(len(times), numpy.inf)
+    maximum = numpy.full(len(times), -numpy.inf)
+
+    settling_edges = numpy.linspace(0.0, t, summary_bins + 1)
+    settling_counts = numpy.zeros(summary_bins, dtype=numpy.int64)
+    overshoot_edges = numpy.linspace(0.0, 1.0, summary_bins + 1)
+    overshoot_counts = numpy.zeros(summary_bins, dtype=numpy.int64)
+    unsettled = 0
+
+    for mass, spring, damp, x, x_dot in _batches(n, batch, sequence, t, dt, ranges):
+        displacement, velocity = analytic_response(mass[:, None], spring[:, None], damp[:, None],
+                                                   x[:, None], x_dot[:, None], times)
+
+        total += displacement.sum(axis=0)
+        squares += (displacement ** 2).sum(axis=0)
+        numpy.minimum(minimum, displacement.min(axis=0), out=minimum)
+        numpy.maximum(maximum, displacement.max(axis=0), out=maximum)
+
+        index = numpy.clip(((displacement + bound) / width).astype(numpy.int64), 0, bins - 1)
+        counts += numpy.bincount((index + offsets).ravel(), minlength=len(counts))
+
+        settling, overshoot = _settling_overshoot(displacement, times, settle)
+        settled = ~numpy.isnan(settling)
+        unsettled += int(numpy.count_nonzero(~settled))
+        settling_counts += numpy.histogram(settling[settled], settling_edges)[0]
+        overshoot_counts += numpy.histogram(overshoot, overshoot_edges)[0]
+
+    counts = counts.reshape(len(times), bins)
+    mean = total / n
+    std = numpy.sqrt(numpy.maximum(squares / n - mean ** 2, 0.0))
+    # a percentile inside a bin is never below the smallest or above the largest sample
+    envelopes = numpy.array([numpy.clip(_histogram_percentile(counts, -bound, width, q), minimum, maximum)
+                             for q in percentiles])
+
+    return MonteCarloResult(n, times, list(percentiles), envelopes, mean, std, minimum, maximum,
+                            settling_edges, settling_counts, unsettled, overshoot_edges, overshoot_counts)
+
+
+# mass, spring, damp, x and x_dot of n random systems, batch at a time, all
+# drawn from one generator seeded by sequence
+def _batches(n, batch, sequence, t, dt, ranges):
+    rng = numpy.random.default_rng(sequence)
+    for start in range(0, n, batch):
+        parameters = random_parameters(min(batch, n - start), rng, t=t, dt=dt, **ranges)
+        yield [parameters[:, column] for column in (0, 1, 2, 5, 6)]
+
+
+# settling time and overshoot of every row of displacement
+def _settling_overshoot(displacement, times, settle):
+    magnitude = abs(displacement)
+    peak_index = magnitude.argmax(axis=1)
+    peak = displacement[numpy.arange(len(displacement)), peak_index]
+
+    outside = magnitude > settle * abs(peak)[:, None]
+    last = outside.shape[1] - 1 - outside[:, ::-1].argmax(axis=1)
+    settling = numpy.where(outside.any(axis=1), times[numpy.minimum(last + 1, len(times) - 1)], times[0])
+    settling[outside[:, -1]] = numpy.nan
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        swing = (-numpy.sign(peak)[:, None] * displacement).max(axis=1)
+        overshoot = numpy.where(peak != 0, numpy.maximum(swing, 0) / abs(peak), 0.0)
+
+    return settling, overshoot
+
+
+# q-th percentile of every row of a histogram with bins starting at low,
+# interpolated linearly inside the bin
+def _histogram_percentile(counts, low, width, q):
+    cumulative = counts.cumsum(axis=1)
+    target = q / 100.0 * cumulative[:, -1]
+
+    index = numpy.minimum((cumulative < target[:, None]).sum(axis=1), counts.shape[1] - 1)
+    rows = numpy.arange(len(counts))
+    before = numpy.where(index > 0, cumulative[rows, numpy.maximum(index - 1, 0)], 0)
+    inside = counts[rows, index]
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        fraction = numpy.where(inside > 0, (target - before) / inside, 0.0)
+
+    return low + (index + fraction) * width
@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 
-from scipy.integrate import odeint
-from numpy import arange
+from scipy.integrate import odeint, solve_ivp
+from numpy import arange, array, asarray, broadcast_arrays, column_stack, cos, empty_like, errstate, exp, sin, sqrt, stack, where, zeros
+from scipy.sparse import diags
+
+# solve_ivp methods accepted by SpringMassDamper.simulate,
+# only the implicit ones make use of the jacobian
+ivp_solvers = ('RK45', 'RK23', 'DOP853', 'Radau', 'BDF', 'LSODA')
+implicit_solvers = ('Radau', 'BDF', 'LSODA')
 
 
 # Simulated spring-mass-damper system, using the ode solver from scipy
@@ -13,17 +19,71 @@ class SpringMassDamper:
         self.t = t
         self.dt = dt
 
-    def simulate(self, x, x_dot):
+    # solver can be 'odeint' (lsoda through scipy's odeint), 'analytic' (exact
+    # closed form solution of the linear system, evaluated on all timesteps at once)
+    # or any solve_ivp method ('RK45', 'Radau', 'BDF', 'LSODA'...).
+    # rtol and atol default to the chosen solver's own tolerances.
+    # The number of right hand side and jacobian evaluations of the last numerical
+    # run are kept in self.nfev and self.njev.
+    # If a SimulationCache is given the states are looked up there first
+    # (and stored there after a new simulation)
+    def simulate(self, x, x_dot, solver='odeint', rtol=None, atol=None, cache=None):
         initial_state = [x, x_dot]
         times = arange(0.0, self.t, self.dt)  # Set the simulation timesteps
 
+        if cache is not None:
+            key = cache.key('smd', self.m, self.k, self.c, self.t, self.dt, x, x_dot, solver, rtol, atol)
+            state = cache.get(key)
+            if state is not None:
+                self.nfev, self.njev = 0, 0
+                return state, times
+
+            state, times = self.simulate(x, x_dot, solver, rtol, atol)
+            return cache.put(key, state), times
+
+        # extra keyword arguments for the solver
+        options = {}
+        if rtol is not None: options['rtol'] = rtol
+        if atol is not None: options['atol'] = atol
+
         # Do the simulation
-        state = odeint(lambda s, t: self.equation(s, t), initial_state, times)
+        if solver == 'analytic':
+            state = column_stack(analytic_response(self.m, self.k, self.c, x, x_dot, times))
+            self.nfev, self.njev = 0, 0
+
+        elif solver == 'odeint':
+            state, info = odeint(lambda s, t: self.equation(s, t), initial_state, times,
+                                 Dfun=lambda s, t: self.jacobian(s, t), full_output=True, **options)
+            self.nfev, self.njev = int(info['nfe'][-1]), int(info['nje'][-1])
+
+        elif solver in ivp_solvers:
+            if solver in implicit_solvers:
+                options['jac'] = lambda t, s: self.jacobian(s, t)
+
+            result = solve_ivp(lambda t, s: self.equation(s, t), (times[0], times[-1]), initial_state,
+                               method=solver, t_eval=times, **options)
+            if not result.success:
+                raise RuntimeError(result.message)
+
+            state = result.y.T
+            self.nfev, self.njev = result.nfev, result.njev
+
+        else:
+            raise ValueError('{0} is not a valid solver'.format(solver))
 
         # Return the states (as [x, x_dot]) and the simulation timesteps
         return state, times
 
 
+    # Runs both solvers and returns the largest absolute difference
+    # between the odeint and the analytic states
+    def verify(self, x, x_dot):
+        numeric, times = self.simulate(x, x_dot, solver='odeint')
+        exact, times = self.simulate(x, x_dot, solver='analytic')
+
+        return abs(numeric - exact).max()
+
+
     # This function takes the current state [x, x_dot] and returns the
     # next velocity and acceleration [x_dot and x_dot_dot].  The
     # function is used by the scipy ode solver.
@@ -38,6 +98,133 @@ class SpringMassDamper:
         return [x_dot, x_dot_dot]
 
 
+    # The system is linear so the jacobian of equation is constant:
+    # d[x_dot, x_dot_dot] / d[x, x_dot]
+    def jacobian(self, state=None, t=None):
+        return array([[0.0, 1.0],
+                      [-self.k / self.m, -self.c / self.m]])
+
+
+# Simulates N systems over the same timesteps in a single solver call.
+# m, k, c, x and x_dot are broadcast to N systems and packed in one state
+# vector [x0, x_dot0, x1, x_dot1, ...], so the right hand side is a couple of
+# numpy operations and the jacobian only has one band each side of the diagonal.
+# solver is the same as SpringMassDamper.simulate.
+# Returns the states as an (N, T, 2) array and the simulation timesteps
+def simulate_many(m, k, c, x, x_dot, t=100.0, dt=0.01, solver='odeint', rtol=None, atol=None):
+    m, k, c, x, x_dot = [value.ravel() for value in
+                         broadcast_arrays(*[asarray(value, dtype=float) for value in (m, k, c, x, x_dot)])]
+    times = arange(0.0, t, dt)
+
+    if solver == 'analytic':
+        position, velocity = analytic_response(m[:, None], k[:, None], c[:, None], x[:, None], x_dot[:, None], times)
+        return stack((position, velocity), axis=-1), times
+
+    spring = -k / m
+    damp = -c / m
+
+    def equation(state, t):
+        state = state.reshape(-1, 2)
+        derivative = empty_like(state)
+        derivative[:, 0] = state[:, 1]
+        derivative[:, 1] = spring * state[:, 0] + damp * state[:, 1]
+        return derivative.ravel()
+
+    # packed jacobian, bands[1 + i - j, j] = d equation[i] / d state[j]
+    bands = zeros((3, 2 * len(m)))
+    bands[0, 1::2] = 1.0
+    bands[1, 1::2] = damp
+    bands[2, 0::2] = spring
+
+    initial_state = stack((x, x_dot), axis=-1).ravel()
+
+    # extra keyword arguments for the solver
+    options = {}
+    if rtol is not None: options['rtol'] = rtol
+    if atol is not None: options['atol'] = atol
+
+    if solver == 'odeint':
+        state = odeint(equation, initial_state, times, Dfun=lambda s, t: bands, ml=1, mu=1, **options)
+
+    elif solver in ivp_solvers:
+        if solver == 'LSODA':
+            options.update(jac=lambda t, s: bands, lband=1, uband=1)
+        elif solver in implicit_solvers:
+            options['jac'] = diags([bands[0, 1:], bands[1], bands[2, :-1]], [1, 0, -1], format='csc')
+
+        result = solve_ivp(lambda t, s: equation(s, t), (times[0], times[-1]), initial_state,
+                           method=solver, t_eval=times, **options)
+        if not result.success:
+            raise RuntimeError(result.message)
+
+        state = result.y.T
+
+    else:
+        raise ValueError('{0} is not a valid solver'.format(solver))
+
+    return state.reshape(len(times), -1, 2).transpose(1, 0, 2), times
+
+
+# Exact solution of m x.. + c x. + k x = 0 at the given times.
+# With alpha = c/2m and disc = alpha^2 - k/m the solution is
+#   x(t)     = x e^-at C(t) + (x_dot + alpha x) e^-at S(t)
+#   x_dot(t) = x_dot e^-at C(t) + (x disc - alpha (x_dot + alpha x)) e^-at S(t)
+# where C, S are cos(wt), sin(wt)/w when under damped, cosh(wt), sinh(wt)/w
+# when over damped and 1, t when critically damped.
+# All the parameters are broadcast against times, so an (N, 1) column of
+# parameters returns (N, T) arrays. Returns (x, x_dot)
+def analytic_response(m, k, c, x, x_dot, times, tolerance=1e-12):
+    m, k, c, x, x_dot = [asarray(value, dtype=float) for value in (m, k, c, x, x_dot)]
+    times = asarray(times, dtype=float)
+
+    alpha = c / (2 * m)
+    disc = alpha ** 2 - k / m
+    w = sqrt(abs(disc))
+
+    # anything close enough to the critical damping uses the critical solution
+    critical = abs(disc) <= tolerance * (k / m)
+    under = (disc < 0) & ~critical
+    over = (disc > 0) & ~critical
+
+    with errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if alpha.ndim == 0:
+            # a single system only needs its own regime
+            regime = 'critical' if critical else 'under' if under else 'over'
+            decay_c, decay_s = _decay(alpha, w, times, regime)
+
+        else:
+            alpha, disc, w, critical, under, over, times = broadcast_arrays(alpha, disc, w, critical, under, over, times)
+            decay_c = zeros(times.shape)
+            decay_s = zeros(times.shape)
+
+            for regime, mask in (('critical', critical), ('under', under), ('over', over)):
+                if mask.any():
+                    regime_c, regime_s = _decay(alpha, w, times, regime)
+                    decay_c = where(mask, regime_c, decay_c)
+                    decay_s = where(mask, regime_s, decay_s)
+
+    b = x_dot + alpha * x
+    position = x * decay_c + b * decay_s
+    velocity = x_dot * decay_c + (x * disc - alpha * b) * decay_s
+
+    return position, velocity
+
+
+# e^-at C(t) and e^-at S(t) for one damping regime (see analytic_response)
+def _decay(alpha, w, times, regime):
+    if regime == 'over':
+        # e^-at cosh(wt) written with the two exponents so it never overflows
+        slow = exp((w - alpha) * times)
+        fast = exp(-(w + alpha) * times)
+        return (slow + fast) / 2, (slow - fast) / (2 * w)
+
+    decay = exp(-alpha * times)
+    if regime == 'under':
+        return decay * cos(w * times), decay * sin(w * times) / w
+
+    return decay, times * decay
+
+
 if __name__ == '__main__':
     smd = SpringMassDamper(m=10.0, k=10.0, c=1.0)
-    state, t = smd.simulate(0.0, 1.0)
\ No newline at end of file
+    state, t = smd.simulate(0.0, 1.0)
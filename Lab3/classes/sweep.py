@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy
+from numpy.lib.format import open_memmap
+from classes.smd import SpringMassDamper
+
+
+# columns of a parameter table, in the order SpringMassDamper and simulate take them
+parameter_names = ('mass', 'spring', 'damp', 't', 'dt', 'x', 'x_dot')
+
+# same ranges gerryspringer draws its random parameters from
+parameter_ranges = {'mass': (1, 10.0),
+                    'spring': (1, 3.0),
+                    'damp': (0.01, 0.5),
+                    't': (25, 500),
+                    'dt': (0.001, 0.1),
+                    'x': (0, 10.0),
+                    'x_dot': (0.1, 5.0)}
+
+
+# Every combination of the given values. Each argument is a number or a list
+# of values, returns an (N, 7) parameter table
+def parameter_grid(mass, spring, damp, t, dt, x, x_dot):
+    values = [numpy.atleast_1d(value) for value in (mass, spring, damp, t, dt, x, x_dot)]
+    return numpy.array(list(itertools.product(*values)), dtype=float).reshape(-1, len(parameter_names))
+
+
+# n random configurations, returns an (n, 7) parameter table.
+# Any parameter can be overridden by keyword with a number (constant), a
+# (low, high) tuple (uniform, integers if both ends are integers) or a
+# function f(rng, n) returning n samples from any other distribution.
+# seed can also be a numpy Generator, which is drawn from and carries on
+def random_parameters(n, seed=None, **ranges):
+    unknown = set(ranges) - set(parameter_names)
+    if unknown:
+        raise ValueError('{0} are not valid parameters'.format(', '.join(sorted(unknown))))
+
+    rng = numpy.random.default_rng(seed)
+    ranges = dict(parameter_ranges, **ranges)
+
+    retval = numpy.empty((n, len(parameter_names)))
+    for column, name in enumerate(parameter_names):
+        value = ranges[name]
+        if callable(value):
+            retval[:, column] = value(rng, n)
+        elif numpy.ndim(value) == 0:
+            retval[:, column] = value
+        elif all(isinstance(v, int) for v in value):
+            retval[:, column] = rng.integers(value[0], value[1], size=n)
+        else:
+            retval[:, column] = rng.uniform(value[0], value[1], size=n)
+
+    return retval
+
+
+# number of timesteps each configuration produces (same as len(arange(0, t, dt)))
+def sweep_steps(parameters):
+    parameters = numpy.asarray(parameters, dtype=float)
+    return numpy.ceil(parameters[:, 3] / parameters[:, 4]).astype(numpy.int64)
+
+
+# Simulates every row of the parameter table on a pool of workers and stores
+# the results in the directory path:
+#   parameters.npy  the (N, 7) parameter table
+#   steps.npy       the number of timesteps of each configuration
+#   offsets.npy     where each configuration starts in states (N+1 entries, the last is the total)
+#   states.npy      (total steps, 2) states of every configuration one after the other
+# Rows are sent to the workers in batches of batch rows and only a few batches
+# per worker are in flight at a time, so the whole result never sits in memory.
+# Threads can be used instead of processes for solvers that release the GIL.
+# Returns the stored arrays (see load_sweep)
+def run_sweep(parameters, path, solver='odeint', workers=None, batch=16, usethreads=False):
+    parameters = numpy.asarray(parameters, dtype=float).reshape(-1, len(parameter_names))
+    steps = sweep_steps(parameters)
+
+    os.makedirs(path, exist_ok=True)
+    numpy.save(os.path.join(path, 'parameters.npy'), parameters)
+    numpy.save(os.path.join(path, 'steps.npy'), steps)
+    offsets = numpy.concatenate(([0], steps.cumsum()))
+    numpy.save(os.path.join(path, 'offsets.npy'), offsets)
+    states = open_memmap(os.path.join(path, 'states.npy'), mode='w+', dtype=numpy.float64,
+                         shape=(int(offsets[-1]), 2))
+
+    workers = workers or os.cpu_count() or 1
+    executor = ThreadPoolExecutor if usethreads else ProcessPoolExecutor
+    with executor(max_workers=workers) as pool:
+        batches = iter(range(0, len(parameters), batch))
+        limit = 2 * workers
+        pending = {}
+
+        while True:
+            for start in itertools.islice(batches, limit - len(pending)):
+                future = pool.submit(_simulate_rows, parameters[start:start + batch], solver)
+                pending[future] = start
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                for n, state in enumerate(future.result(), start):
+                    # a run of another length would spill into its neighbour
+                    if len(state) != steps[n]:
+                        raise RuntimeError('configuration {0} gave {1} timesteps, not {2}'.format(n, len(state), steps[n]))
+                    states[offsets[n]:offsets[n+1]] = state
+
+    states.flush()
+    del states
+
+    return load_sweep(path)
+
+
+# Opens a sweep stored by run_sweep, states are memory mapped unless mmap_mode is None.
+# Returns (parameters, steps, states), states is a list with the (steps, 2)
+# states of every configuration, views into the one stored array
+def load_sweep(path, mmap_mode='r'):
+    parameters = numpy.load(os.path.join(path, 'parameters.npy'))
+    steps = numpy.load(os.path.join(path, 'steps.npy'))
+    offsets = numpy.load(os.path.join(path, 'offsets.npy')).tolist()
+    stored = numpy.load(os.path.join(path, 'states.npy'), mmap_mode=mmap_mode)
+
+    states = [stored[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    return parameters, steps, states
+
+
+# Worker side of run_sweep, simulates a batch of parameter rows
+def _simulate_rows(rows, solver):
+    retval = []
+    for mass, spring, damp, t, dt, x, x_dot in rows:
+        state, times = SpringMassDamper(mass, spring, damp, t, dt).simulate(x, x_dot, solver)
+        retval.append(state)
+
+    return retval
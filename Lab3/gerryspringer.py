@@ -1,11 +1,13 @@
 #!/usr/bin/python3
 
 from classes.smd import SpringMassDamper
+from classes.montecarlo import monte_carlo
 import matplotlib.pyplot as plt
 from matplotlib.pylab import figtext
 import sys, getopt
 from classes.utils import *
 import random
+import numpy
 
 helpstring = '''
 gerryspringer.py
@@ -17,13 +19,18 @@ gerryspringer.py
     -dt or --delta=  time slice    (default between 0.001, 0.1)
     -x  or --pos=    initial pos   (default between 0, 10.0)
     -xd or --vel=    initial vel   (default between 0.1, 5.0)
+    -s  or --solver= odeint, analytic, RK45, Radau, BDF or LSODA (default odeint)
+    -n  or --samples= monte carlo, simulates that many random systems for
+                     the same t and dt and plots the displacement percentiles
+                     with the settling time and overshoot distributions
     e.g. ./gerryspringer.py -m3 --vel=4 will simulate a system
         where the mass is 3 kg, the initial velocity is 5m/s
         all other parameters will be randomly generated
+    e.g. ./gerryspringer.py -n100000 -t60 --delta=0.01
     '''
 
-shortParams = 'hm:k:c:t:dt:x:xd:'
-longParams = ['help','mass=', 'spring=', 'damp=', 'time=', 'delta=', 'pos=', 'vel=']
+shortParams = 'hm:k:c:t:dt:x:xd:s:n:'
+longParams = ['help','mass=', 'spring=', 'damp=', 'time=', 'delta=', 'pos=', 'vel=', 'solver=', 'samples=']
 
 
 def get_parameters(argv, shortparams='h', longparams=[help]):
@@ -34,10 +41,12 @@ def get_parameters(argv, shortparams='h', longparams=[help]):
     dt = random.uniform(0.1, 0.001)
     x = random.uniform(0, 10.0)
     x_dot = random.uniform(0.1, 5.0)
+    solver = 'odeint'
+    samples = 0
 
     # if no argument then runs all the simulations and uses matplotlib
     if len(argv) < 1:
-        return mass, spring, damp, t, dt, x, x_dot
+        return mass, spring, damp, t, dt, x, x_dot, solver, samples
 
     else: #parses the arguments
         try:
@@ -72,7 +81,13 @@ def get_parameters(argv, shortparams='h', longparams=[help]):
             elif opt in ("-xd", "--vel"):
                 x_dot = get_floatparam(arg, dt, 0.1, 5.0)
 
-    return mass, spring, damp, t, dt, x, x_dot
+            elif opt in ("-s", "--solver"):
+                solver = arg
+
+            elif opt in ("-n", "--samples"):
+                samples = get_intparam(arg, samples, 1)
+
+    return mass, spring, damp, t, dt, x, x_dot, solver, samples
 
 
 def draw_plot(states, times, caption):
@@ -95,15 +110,62 @@ def draw_plot(states, times, caption):
         print(ex)
 
 
+# percentile bands of the displacement over time on top, the settling time
+# and overshoot histograms below
+def draw_envelope(result, caption):
+    try:
+        with plt.xkcd():
+            fig = plt.figure()
+            fig.suptitle('Spring damping over time, {0} systems'.format(result.samples),  fontsize=18, fontweight='bold')
+
+            ax = fig.add_subplot(2, 1, 1)
+            bands = len(result.percentiles) // 2
+            for n in range(bands):
+                ax.fill_between(result.times, result.envelopes[n], result.envelopes[-1 - n], alpha=0.2 + 0.6 * n / max(bands, 1),
+                                color='steelblue', label='{0}-{1}%'.format(result.percentiles[n], result.percentiles[-1 - n]))
+            if len(result.percentiles) % 2:
+                ax.plot(result.times, result.envelopes[bands], color='navy', label='median')
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Displacement (m)')
+            ax.axis('tight')
+            ax.legend(loc='upper right')
+
+            edges = result.settling_edges
+            ax = fig.add_subplot(2, 2, 3)
+            ax.bar(edges[:-1], result.settling_counts, width=numpy.diff(edges), align='edge')
+            ax.set_xlabel('Settling time (s), {0:.0f}% unsettled'.format(100.0 * result.unsettled / result.samples))
+
+            edges = result.overshoot_edges
+            ax = fig.add_subplot(2, 2, 4)
+            ax.bar(edges[:-1], result.overshoot_counts, width=numpy.diff(edges), align='edge')
+            ax.set_xlabel('Overshoot (fraction of peak)')
+
+            figtext(.52, .55, caption)
+            plt.show()
+
+    except Exception as ex:
+        print(ex)
+
+
 def main(argv):
 
-    mass, spring, damp, t, dt, x, x_dot = get_parameters(argv, shortParams, longParams)
+    mass, spring, damp, t, dt, x, x_dot, solver, samples = get_parameters(argv, shortParams, longParams)
+
+    if samples:
+        try:
+            caption = 't={0}s, dt={1:.3f}s'.format(t, dt)
+            draw_envelope(monte_carlo(samples, t, dt), caption)
+
+        except Exception as ex:
+            print(ex)
+
+        return
 
     try:
         caption = 'Initial conditions:\nM={0:.2f} Kg, K={1:.2f}, C={2:.2f}ns/m \n t={3}s, dt={4:.3f}s\n x={5:.3f}m, xdot={6:.3f}ms'.format(mass, spring, damp, t, dt, x, x_dot)
 
         gerry = SpringMassDamper(mass, spring, damp, t, dt)
-        states, times = gerry.simulate(x, x_dot)
+        states, times = gerry.simulate(x, x_dot, solver)
         draw_plot(states, times, caption)
 
     except Exception as ex:
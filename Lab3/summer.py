@@ -3,11 +3,11 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from classes.utils import *
-from time import clock, process_time, time, perf_counter
+from time import process_time, time, perf_counter
 
 
-timers = [time, clock, process_time, perf_counter]  #different timing functions
-tcaptions = ['time', 'clock', 'ptime', 'pcounter']
+timers = [time, process_time, perf_counter]  #different timing functions
+tcaptions = ['time', 'ptime', 'pcounter']
 listlen = [1, 10, 100, 1000, 10000,  100000, 1000000]
 
 
@@ -30,19 +30,14 @@ def time_list_sort(lists, func=sorted):
         print(ex)
 
 
+# median seconds per call for every timer, see utils.benchmark
 def timethis(func, list, epochs=10):
     retval = []
     for timer in timers:
         print('Processing function {0}'.format(timer))
-        tempval = 0
-        for n in range(epochs):
-            t1 = timer()
-            x = func(list)
-            tempval += (timer() - t1)
+        result = benchmark(func, list, timer=timer, samples=epochs)
 
-        tempval = tempval/epochs
-
-        retval.append(tempval)
+        retval.append(result['median'])
 
     return retval
 
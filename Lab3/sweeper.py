@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+from classes.sweep import random_parameters, run_sweep
+import sys, getopt
+from classes.utils import *
+
+helpstring = '''
+sweeper.py
+    -h prints this help out
+    -n  or --samples= number of random configurations (default 1000)
+    -o  or --output=  directory the results are stored in (default sweep)
+    -w  or --workers= worker processes (default one per core)
+    -b  or --batch=   configurations sent to a worker at a time (default 16)
+    -s  or --solver=  odeint, analytic, RK45, Radau, BDF or LSODA (default odeint)
+    -r  or --seed=    random seed (default random)
+    The configurations are drawn from the same ranges as gerryspringer.py,
+    nothing is plotted. Load the results with classes.sweep.load_sweep
+    e.g. ./sweeper.py -n10000 -o big_sweep
+    '''
+
+shortParams = 'hn:o:w:b:s:r:'
+longParams = ['help', 'samples=', 'output=', 'workers=', 'batch=', 'solver=', 'seed=']
+
+
+def get_parameters(argv):
+    samples, output, workers, batch, solver, seed = 1000, 'sweep', None, 16, 'odeint', None
+
+    try:
+        opts, args = getopt.getopt(argv, shortParams, longParams)
+    except getopt.GetoptError:
+        print(helpstring)
+        sys.exit(command_line_syntax_error)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print(helpstring)
+            sys.exit(normal_termination)
+
+        elif opt in ("-n", "--samples"):
+            samples = get_intparam(arg, samples, 1)
+
+        elif opt in ("-o", "--output"):
+            output = arg
+
+        elif opt in ("-w", "--workers"):
+            workers = get_intparam(arg, workers, 1)
+
+        elif opt in ("-b", "--batch"):
+            batch = get_intparam(arg, batch, 1)
+
+        elif opt in ("-s", "--solver"):
+            solver = arg
+
+        elif opt in ("-r", "--seed"):
+            seed = get_intparam(arg, seed)
+
+    return samples, output, workers, batch, solver, seed
+
+
+def main(argv):
+    samples, output, workers, batch, solver, seed = get_parameters(argv)
+
+    try:
+        parameters = random_parameters(samples, seed)
+        parameters, steps, states = run_sweep(parameters, output, solver, workers, batch)
+        print('{0} configurations, {1} timesteps stored in {2}'.format(len(parameters), steps.sum(), output))
+
+    except Exception as ex:
+        print(ex)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
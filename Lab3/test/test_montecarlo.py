@@ -0,0 +1,59 @@
+import os
+import sys
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.montecarlo import monte_carlo, _batches, _settling_overshoot
+from classes.smd import analytic_response
+
+
+class TestMonteCarlo(TestCase):
+    def setUp(self):
+        self.n, self.t, self.dt, self.batch = 500, 20.0, 0.05, 128
+        self.result = monte_carlo(self.n, self.t, self.dt, batch=self.batch, seed=7)
+
+        # the same draws as monte_carlo, all at once
+        columns = list(zip(*_batches(self.n, self.batch, numpy.random.SeedSequence(7), self.t, self.dt, {})))
+        self.mass, self.spring, self.damp, self.x, self.x_dot = [numpy.concatenate(column) for column in columns]
+        self.displacement = analytic_response(self.mass[:, None], self.spring[:, None], self.damp[:, None],
+                                              self.x[:, None], self.x_dot[:, None], self.result.times)[0]
+
+    def test_envelopes(self):
+        bound = numpy.sqrt(self.x ** 2 + self.mass * self.x_dot ** 2 / self.spring).max()
+        width = 2 * bound / 256
+        for q, envelope in zip(self.result.percentiles, self.result.envelopes):
+            # the histograms count the samples up to q n, the inverse of the empirical distribution
+            exact = numpy.percentile(self.displacement, q, axis=0, method='inverted_cdf')
+            self.assertLessEqual(abs(envelope - exact).max(), width, q)
+
+    def test_moments(self):
+        numpy.testing.assert_allclose(self.result.mean, self.displacement.mean(axis=0), rtol=1e-9, atol=1e-12)
+        numpy.testing.assert_allclose(self.result.std, self.displacement.std(axis=0), rtol=1e-6, atol=1e-9)
+        self.assertEqual(self.result.minimum.tolist(), self.displacement.min(axis=0).tolist())
+        self.assertEqual(self.result.maximum.tolist(), self.displacement.max(axis=0).tolist())
+
+    def test_settling_overshoot(self):
+        result = self.result
+        self.assertEqual(result.samples, self.n)
+        self.assertEqual(result.settling_counts.sum(), self.n - result.unsettled)
+        self.assertEqual(result.overshoot_counts.sum(), self.n)
+
+        settling, overshoot = _settling_overshoot(self.displacement, result.times, 0.02)
+        self.assertEqual(result.unsettled, numpy.count_nonzero(numpy.isnan(settling)))
+        self.assertEqual(result.settling_counts.tolist(),
+                         numpy.histogram(settling[~numpy.isnan(settling)], result.settling_edges)[0].tolist())
+        self.assertEqual(result.overshoot_counts.tolist(), numpy.histogram(overshoot, result.overshoot_edges)[0].tolist())
+
+    def test_at_rest(self):
+        result = monte_carlo(20, 5.0, 0.1, seed=1, x=0.0, x_dot=0.0)
+        self.assertEqual(abs(result.envelopes).max(), 0.0)
+        self.assertEqual(result.overshoot_counts.sum(), 20)
+
+    def test_memory(self):
+        # a small budget lowers the bins and the batch, the statistics stay close
+        small = monte_carlo(self.n, self.t, self.dt, seed=7, memory=2**20)
+        numpy.testing.assert_allclose(small.mean.mean(), self.result.mean.mean(), atol=0.2)
+        self.assertEqual(small.settling_counts.sum() + small.unsettled, self.n)
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.smd import SpringMassDamper, simulate_many, analytic_response
+from classes.cache import SimulationCache
+
+
+class TestSpringMassDamper(TestCase):
+    def setUp(self):
+        # mass, spring, damping: under, over and critically damped, then just
+        # either side of the critical damping (2 sqrt(k m) = 8)
+        self.systems = [(10.0, 10.0, 1.0), (1.0, 1.0, 5.0), (2.0, 8.0, 8.0),
+                        (2.0, 8.0, 8.0 * (1 + 1e-9)), (2.0, 8.0, 8.0 * (1 - 1e-9)),
+                        (2.0, 8.0, 8.0 * (1 + 1e-4)), (2.0, 8.0, 8.0 * (1 - 1e-4))]
+
+    def test_analytic_against_odeint(self):
+        for m, k, c in self.systems:
+            smd = SpringMassDamper(m, k, c, t=20.0, dt=0.01)
+            exact, times = smd.simulate(2.0, -1.0, solver='analytic')
+            numeric, times = smd.simulate(2.0, -1.0, solver='odeint', rtol=1e-11, atol=1e-12)
+            self.assertEqual(exact.shape, numeric.shape)
+            self.assertLess(abs(exact - numeric).max(), 1e-8, (m, k, c))
+            self.assertEqual(exact[0].tolist(), [2.0, -1.0])
+
+    def test_analytic_broadcast(self):
+        m, k, c = [numpy.array(column)[:, None] for column in zip(*self.systems)]
+        times = numpy.arange(0.0, 5.0, 0.1)
+        position, velocity = analytic_response(m, k, c, 1.0, 0.5, times)
+        self.assertEqual(position.shape, (len(self.systems), len(times)))
+        for n, (mass, spring, damp) in enumerate(self.systems):
+            single = analytic_response(mass, spring, damp, 1.0, 0.5, times)
+            numpy.testing.assert_allclose(position[n], single[0], rtol=1e-12, atol=1e-15)
+            numpy.testing.assert_allclose(velocity[n], single[1], rtol=1e-12, atol=1e-15)
+
+    def test_verify(self):
+        for m, k, c in self.systems:
+            self.assertLess(SpringMassDamper(m, k, c, t=20.0).verify(1.0, 1.0), 1e-4)
+
+    def test_simulate_many(self):
+        m, k, c = [numpy.array(column) for column in zip(*self.systems)]
+        x, x_dot = numpy.linspace(-2, 2, len(m)), 0.5
+        for solver in ['odeint', 'LSODA', 'Radau', 'BDF', 'RK45', 'analytic']:
+            states, times = simulate_many(m, k, c, x, x_dot, t=10.0, dt=0.05, solver=solver, rtol=1e-10, atol=1e-12)
+            self.assertEqual(states.shape, (len(m), len(times), 2))
+            for n in range(len(m)):
+                single, single_times = SpringMassDamper(m[n], k[n], c[n], t=10.0, dt=0.05).simulate(
+                    x[n], x_dot, solver=solver, rtol=1e-10, atol=1e-12)
+                self.assertEqual(times.tolist(), single_times.tolist())
+                self.assertLess(abs(states[n] - single).max(), 1e-7, (solver, n))
+
+    def test_invalid_solver(self):
+        self.assertRaises(ValueError, SpringMassDamper().simulate, 1.0, 1.0, 'foo')
+        self.assertRaises(ValueError, simulate_many, 1.0, 1.0, 1.0, 1.0, 1.0, 10.0, 0.1, 'foo')
+
+    def test_tolerances(self):
+        smd = SpringMassDamper(10.0, 10.0, 1.0, t=20.0)
+        exact, times = smd.simulate(1.0, 1.0, solver='analytic')
+        for solver in ['odeint', 'LSODA', 'Radau', 'RK45']:
+            loose, times = smd.simulate(1.0, 1.0, solver=solver, rtol=1e-3, atol=1e-6)
+            loose_nfev = smd.nfev
+            tight, times = smd.simulate(1.0, 1.0, solver=solver, rtol=1e-10, atol=1e-12)
+            self.assertGreater(smd.nfev, loose_nfev, solver)
+            self.assertLess(abs(tight - exact).max(), abs(loose - exact).max() / 100, solver)
+
+            loose, times = simulate_many([10.0, 1.0], 10.0, 1.0, 1.0, 1.0, t=20.0, solver=solver, rtol=1e-3, atol=1e-6)
+            tight, times = simulate_many([10.0, 1.0], 10.0, 1.0, 1.0, 1.0, t=20.0, solver=solver, rtol=1e-10, atol=1e-12)
+            self.assertLess(abs(tight[0] - exact).max(), abs(loose[0] - exact).max() / 100, solver)
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SimulationCache(directory)
+            smd = SpringMassDamper(10.0, 10.0, 1.0, t=10.0)
+            state, times = smd.simulate(1.0, 1.0)
+            for n in range(2):
+                cached, cached_times = smd.simulate(1, 1.0, cache=cache)
+                self.assertEqual(cached.tolist(), state.tolist())
+                self.assertEqual(cached_times.tolist(), times.tolist())
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(smd.nfev, 0)
+            del cached
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classes.sweep import parameter_grid, random_parameters, sweep_steps, run_sweep, load_sweep
+from classes.smd import SpringMassDamper
+
+
+class TestSweep(TestCase):
+    def test_parameter_grid(self):
+        grid = parameter_grid([1.0, 2.0], 3.0, [0.1, 0.2, 0.3], 10.0, 0.1, 1.0, [0.0, 1.0])
+        self.assertEqual(grid.shape, (12, 7))
+        self.assertEqual(grid[0].tolist(), [1.0, 3.0, 0.1, 10.0, 0.1, 1.0, 0.0])
+        self.assertEqual(grid[-1].tolist(), [2.0, 3.0, 0.3, 10.0, 0.1, 1.0, 1.0])
+
+    def test_random_parameters(self):
+        table = random_parameters(1000, 3, mass=2.0, t=(25, 30), x_dot=lambda rng, n: rng.normal(0, 1, n))
+        self.assertEqual(table.shape, (1000, 7))
+        self.assertEqual(set(table[:, 0].tolist()), {2.0})
+        self.assertTrue(set(table[:, 3].tolist()) <= set(range(25, 30)))
+        self.assertTrue(((table[:, 2] >= 0.01) & (table[:, 2] < 0.5)).all())
+        self.assertEqual(table.tolist(), random_parameters(1000, 3, mass=2.0, t=(25, 30),
+                                                           x_dot=lambda rng, n: rng.normal(0, 1, n)).tolist())
+        self.assertRaises(ValueError, random_parameters, 10, 3, weight=1.0)
+
+    def test_sweep_steps(self):
+        table = random_parameters(20000, 5)
+        self.assertEqual(sweep_steps(table).tolist(), [len(numpy.arange(0.0, t, dt)) for t, dt in table[:, 3:5]])
+
+    def test_run_sweep(self):
+        table = random_parameters(11, 4, t=(5, 30), dt=(0.01, 0.1))
+        with tempfile.TemporaryDirectory() as directory:
+            parameters, steps, states = run_sweep(table, directory, workers=2, batch=3)
+            self.assertEqual(parameters.tolist(), table.tolist())
+            self.assertEqual(len(states), len(table))
+
+            for n, (mass, spring, damp, t, dt, x, x_dot) in enumerate(table):
+                state, times = SpringMassDamper(mass, spring, damp, t, dt).simulate(x, x_dot)
+                self.assertEqual(len(states[n]), steps[n])
+                self.assertEqual(states[n].tolist(), state.tolist())
+
+            loaded = load_sweep(directory, mmap_mode=None)
+            self.assertEqual([state.tolist() for state in loaded[2]], [state.tolist() for state in states])
+            del states, loaded
+
+    def test_run_sweep_empty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            parameters, steps, states = run_sweep(numpy.empty((0, 7)), directory, workers=1)
+            self.assertEqual((parameters.shape, len(steps), states), ((0, 7), 0, []))
@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 from classes.utils import *
 
 listlen = [500, 1000, 2000, 3000]#,  100000, 1000000]
-tcaptions = ['time', 'clock', 'ptime', 'pcounter']
+tcaptions = ['time', 'ptime', 'pcounter']
 scaptions =['sorted', 'bubble', 'insertion', 'merge', 'quick']
 
 algorithms = [sorted, bubble_sort, insertion_sort, merge_sort, quick_sort]
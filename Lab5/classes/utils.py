@@ -1,9 +1,10 @@
 #!/usr/bin/python3
 
-from math import sqrt, pi, e
+from math import sqrt, pi, e, lgamma
 import numbers
 import sys
-from time import clock, process_time, time, perf_counter
+from time import process_time, time, perf_counter, process_time_ns, time_ns, perf_counter_ns
+import gc
 import numpy as np
 from copy import copy, deepcopy
 
@@ -21,19 +22,71 @@ def mean(data):
     return float(tempVal/len(data))
 
 
+# median, quantile and quantiles only place the elements they need with
+# numpy.partition (introselect, O(n)) instead of sorting everything.
+# Lists up to selection_cutoff long (below it converting them to an array
+# costs more than sorting them) and anything not numeric are just sorted
+selection_cutoff = 1024
+
+
 def median(data):
-    temp = sorted(data)
+    index = int((len(data)-1)/2)
+    if not isinstance(data, np.ndarray) and len(data) <= selection_cutoff:
+        temp = sorted(data)
+        return temp[index] if not isEven(len(data)) else (temp[index]+temp[index+1])/2
+
     if not isEven(len(data)):
-        index = int((len(data)-1)/2)
-        retVal = temp[index]
+        retVal = __item(__partitioned(data, [index])[index])
     else:
-        index = int((len(data)-1)/2)
-        left = temp[index]
-        right = temp[index+1]
+        temp = __partitioned(data, [index, index+1])
+        left = __item(temp[index])
+        right = __item(temp[index+1])
         retVal = (left+right)/2
     return retVal
 
 
+# q-th quantile (0 to 1) interpolated linearly between the closest elements,
+# the same as numpy.quantile
+def quantile(data, q):
+    return quantiles(data, [q])[0]
+
+
+# several quantiles sharing one partitioning of the data
+def quantiles(data, qs):
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError('{0} is not a valid quantile'.format(q))
+
+    positions = [(len(data)-1) * q for q in qs]
+    below = [min(int(position), len(data)-1) for position in positions]
+    above = [min(index+1, len(data)-1) for index in below]
+    temp = __partitioned(data, sorted(set(below + above)))
+
+    retval = []
+    for position, index, upper in zip(positions, below, above):
+        left, right = __item(temp[index]), __item(temp[upper])
+        retval.append(left + (position-index) * (right-left) if upper != index else left)
+
+    return retval
+
+
+# data with the elements at indices where they would be if it was sorted
+def __partitioned(data, indices):
+    if not isinstance(data, np.ndarray) and len(data) <= selection_cutoff:
+        return sorted(data)
+
+    values = np.asarray(data)
+    if values.ndim != 1 or values.dtype.kind not in 'biuf':
+        return sorted(data)
+
+    return np.partition(values, indices)
+
+
+# numpy scalars back to python numbers
+def __item(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
 def factorialStirling(n):
     #using stirling's Approximation
     retval = sqrt(2*pi*n) * (n/e)**n
@@ -41,6 +94,14 @@ def factorialStirling(n):
     return int(retval)
 
 
+# Factorials below factorial_table_size are kept in factorial_table as they
+# are computed, larger ones start from the last one in the table and multiply
+# the rest of the numbers by binary splitting (products of similar sized
+# halves are much quicker than multiplying one number at a time)
+factorial_table_size = 512
+factorial_table = [1]
+
+
 def factorial(n):
     if n == 0: return 1
     if n < 0: raise ValueError('N must be either 0 or a positive integer')
@@ -48,25 +109,85 @@ def factorial(n):
         n = int(abs(n))
     if not isinstance(n, numbers.Integral): raise ValueError('Dammit Jim! N must be an integer')
 
-    retval = n
-    while n > 1:
-        t = n-1
-        retval, n = retval * t, t
+    if n < factorial_table_size:
+        while len(factorial_table) <= n:
+            factorial_table.append(factorial_table[-1] * len(factorial_table))
+        return factorial_table[n]
 
-    return int(retval)
+    return factorial(factorial_table_size-1) * __product(factorial_table_size-1, n)
+
+
+# product of the integers from low+1 to high
+def __product(low, high):
+    if high - low < 16:
+        retval = 1
+        for n in range(low+1, high+1):
+            retval *= n
+        return retval
+
+    middle = (low + high) // 2
+    return __product(low, middle) * __product(middle, high)
+
+
+log_factorial_table = np.array([lgamma(n+1) for n in range(factorial_table_size)])
+
+
+# Natural log of n!, n can be a number or an array of them (returns an array).
+# Small n come from a table, large ones from Stirling's series which is
+# accurate to double precision there
+def log_factorial(n):
+    values = np.asarray(n, dtype=float)
+    if np.any(values < 0) or np.any(values != np.floor(values)):
+        raise ValueError('{0} is not a valid factorial argument'.format(n))
 
+    retval = np.empty(values.shape)
+    small = values < factorial_table_size
+    retval[small] = log_factorial_table[values[small].astype(int)]
 
+    x = values[~small]
+    retval[~small] = (x*np.log(x) - x + 0.5*np.log(2*pi*x)
+                      + 1/(12*x) - 1/(360*x**3) + 1/(1260*x**5))
+
+    return retval.item() if np.ndim(n) == 0 else retval
+
+
+# Fraction of data strictly between mean - stddev*multiplier and
+# mean + stddev*multiplier. multiplier can be a list (e.g. [1, 2, 3]), then a
+# list of fractions is returned: one comparison pass for a single multiplier,
+# one sort and a binary search per bound for several
 def percent_within_StdDev(data, stddev=0, multiplier=1):
-    meanval = mean(data)
-    leftboundary = meanval - (stddev*multiplier)
-    rightboundary = meanval + (stddev*multiplier)
+    values = np.asarray(data, dtype=float)
+    meanval = values.mean().item() if isinstance(data, np.ndarray) else mean(data)
+    multipliers = np.atleast_1d(np.asarray(multiplier, dtype=float))
+    leftboundary = meanval - (stddev*multipliers)
+    rightboundary = meanval + (stddev*multipliers)
+
+    if len(multipliers) == 1:
+        counters = [np.count_nonzero((values > leftboundary[0]) & (values < rightboundary[0]))]
+    else:
+        temp = np.sort(values)
+        # crossed bounds (a negative multiplier) hold nothing, as for a single one
+        counters = np.maximum(np.searchsorted(temp, rightboundary, 'left') - np.searchsorted(temp, leftboundary, 'right'), 0)
+
+    retval = [int(counter)/len(data) for counter in counters]
+    return retval if np.ndim(multiplier) else retval[0]
+
+
+# Approximate percent_within_StdDev for data only known as a histogram
+# (counts of the samples between consecutive edges, e.g. a stream), bins cut
+# by a boundary count for the part inside it. total is the number of samples
+# if some fell outside the edges
+def histogram_within(counts, edges, meanval, stddev=0, multiplier=1, total=None):
+    counts = np.asarray(counts)
+    edges = np.asarray(edges, dtype=float)
+    multipliers = np.atleast_1d(np.asarray(multiplier, dtype=float))[:, None]
+    leftboundary = meanval - (stddev*multipliers)
+    rightboundary = meanval + (stddev*multipliers)
 
-    counter = 0
-    for n in data:
-        if n > leftboundary and n < rightboundary:
-            counter +=1
+    inside = np.clip(np.minimum(edges[1:], rightboundary) - np.maximum(edges[:-1], leftboundary), 0, None)
+    retval = ((counts * inside / np.diff(edges)).sum(axis=1) / (counts.sum() if total is None else total)).tolist()
 
-    return counter/len(data)
+    return retval if np.ndim(multiplier) else retval[0]
 
 #endregion
 
@@ -285,9 +406,76 @@ def isReallySorted(data):
 
 
 #region Timers
-timers = [time, clock, process_time, perf_counter]  #different timing functions
+timers = [time, process_time, perf_counter]  #different timing functions
+
+# Timers with a nanosecond integer version are read through it, the integer
+# counts do not lose precision the way large float timestamps do
+nanotimers = {time: time_ns, process_time: process_time_ns, perf_counter: perf_counter_ns}
+
+
+# Times func(*args). After warmup calls the number of calls per sample
+# (loops) is raised until a sample lasts at least min_time seconds, then
+# samples samples are taken with the garbage collector off (unless usegc).
+# Returns a dictionary of plain numbers (json ready): the seconds per call
+# of every sample, their median, min, max, mean, quartiles and iqr, and a
+# bootstrap confidence interval of the median
+def benchmark(func, *args, timer=perf_counter, samples=20, warmup=1, min_time=0.005, loops=None,
+              usegc=False, confidence=0.95, resamples=2000, seed=None):
+    timer = nanotimers.get(timer, timer)
+    scale = 1e-9 if timer in nanotimers.values() else 1.0
+
+    for n in range(warmup):
+        func(*args)
+
+    gcenabled = gc.isenabled()
+    if not usegc:
+        gc.disable()
+
+    try:
+        if loops is None:
+            loops = __calibrate(func, args, timer, min_time / scale)
 
-def time_list_sort(lists, func=sorted, epochs=10, timers=[time, clock, process_time, perf_counter]):
+        runs = []
+        for n in range(samples):
+            t1 = timer()
+            for k in range(loops):
+                func(*args)
+            runs.append((timer() - t1) * scale / loops)
+
+    finally:
+        if gcenabled:
+            gc.enable()
+
+    runs = np.array(runs)
+    q1, median, q3 = np.percentile(runs, [25, 50, 75])
+
+    medians = np.median(np.random.default_rng(seed).choice(runs, (resamples, len(runs))), axis=1)
+    low, high = np.percentile(medians, [50 * (1-confidence), 50 * (1+confidence)])
+
+    return {'function': getattr(func, '__name__', repr(func)), 'timer': timer.__name__,
+            'loops': loops, 'samples': runs.tolist(),
+            'median': float(median), 'min': float(runs.min()), 'max': float(runs.max()),
+            'mean': float(runs.mean()), 'q1': float(q1), 'q3': float(q3), 'iqr': float(q3 - q1),
+            'confidence': confidence, 'ci': [float(low), float(high)]}
+
+
+# calls per sample so a sample lasts at least target timer units
+def __calibrate(func, args, timer, target):
+    loops = 1
+    while True:
+        t1 = timer()
+        for k in range(loops):
+            func(*args)
+        elapsed = timer() - t1
+
+        if elapsed >= target or loops >= 10**9:
+            return loops
+
+        # aim a little over the target, at most 10 times more calls per try
+        loops = loops * 10 if elapsed <= 0 else max(loops + 1, min(loops * 10, int(loops * 1.2 * target / elapsed)))
+
+
+def time_list_sort(lists, func=sorted, epochs=10, timers=[time, process_time, perf_counter]):
     retval=[]
     try:
         for n in lists:
@@ -299,7 +487,7 @@ def time_list_sort(lists, func=sorted, epochs=10, timers=[time, clock, process_t
         print(ex)
 
 
-def time_algorithms(algorithms, data, epochs=10, timers=[time, clock, process_time, perf_counter]):
+def time_algorithms(algorithms, data, epochs=10, timers=[time, process_time, perf_counter]):
     retval=[]
 
     try:
@@ -322,20 +510,15 @@ def time_algorithms(algorithms, data, epochs=10, timers=[time, clock, process_ti
 
 
 
+# median seconds per call of func(data) for every timer, epochs samples each
 def __timethis(func, data, epochs, timers):
     tempdata = copy(data)
     retval = []
     for timer in timers:
         print('Processing {0} {1} {2}'.format(len(data), func, timer))
-        tempval = 0
-        for n in range(epochs):
-            t1 = timer()
-            x = func(tempdata)
-            tempval += (timer() - t1)
-
-        tempval = tempval/epochs
+        result = benchmark(func, tempdata, timer=timer, samples=epochs)
 
-        retval.append(tempval)
+        retval.append(result['median'])
 
     return retval
 
@@ -0,0 +1,31 @@
+from unittest import TestCase
+from time import process_time, perf_counter
+import json
+from Lab5.classes.utils import benchmark, time_list_sort
+
+
+class TestUtils(TestCase):
+
+    def test_benchmark(self):
+        data = list(range(1000, 0, -1))
+        result = benchmark(sorted, data, samples=15, min_time=0.001, seed=1)
+
+        self.assertEqual(result['function'], 'sorted')
+        self.assertEqual(result['timer'], 'perf_counter_ns')
+        self.assertEqual(len(result['samples']), 15)
+        self.assertGreaterEqual(result['loops'], 1)
+        self.assertTrue(result['min'] <= result['q1'] <= result['median'] <= result['q3'] <= result['max'])
+        self.assertTrue(result['min'] <= result['ci'][0] <= result['median'] <= result['ci'][1] <= result['max'])
+        self.assertAlmostEqual(result['iqr'], result['q3'] - result['q1'])
+        self.assertEqual(json.loads(json.dumps(result)), result)
+
+    def test_benchmark_loops(self):
+        calls = []
+        result = benchmark(calls.append, 1, samples=4, warmup=2, loops=3, timer=process_time)
+        self.assertEqual(len(calls), 2 + 4 * 3)
+        self.assertEqual(result['timer'], 'process_time_ns')
+
+    def test_time_list_sort(self):
+        times = time_list_sort([[3, 2, 1], list(range(100))], sorted, epochs=5, timers=[perf_counter])
+        self.assertEqual(len(times), 2)
+        self.assertTrue(all(len(value) == 1 and value[0] > 0 for value in times))
@@ -1,4 +1,6 @@
 #!/usr/bin/python3
+from collections import deque
+from heapq import heapify, heappop, heappush
 import numpy
 from Lab6.classes.utils import mean, median
 
@@ -12,9 +14,14 @@ class FilterHelper(object):
         return filtered
 
 
-    def filterData(self, data, window=1, usemedian=False, usenumpy=True):
+    # usefast runs the median filter in O(n log w) instead of sorting a slice
+    # of the data for every sample (the mean filter is unchanged)
+    def filterData(self, data, window=1, usemedian=False, usenumpy=True, usefast=False):
         if (window < 1): window = 1
 
+        if usefast == True and usemedian == True:
+            return sliding_median(data, window).tolist()
+
         func = self.__getfilterFunction(usemedian, usenumpy)
         filtered = []
         width = int((window-1) /2)
@@ -50,4 +57,168 @@ class FilterHelper(object):
             else:
                 func = mean
 
-        return func
\ No newline at end of file
+        return func
+
+
+# Start and end (exclusive) index of the window of every sample, arrays of
+# the same length as the data. The edges are the ones of
+# FilterHelper.filterData: with width = (window-1)/2 the first samples use data[0:n+width+1], the last
+# ones data[n-width-1:] and the others data[n-width-1:n+width]
+def window_bounds(length, window=1):
+    if (window < 1): window = 1
+
+    width = int((window-1) /2)
+    lenData = length-1
+    n = numpy.arange(length)
+
+    lo = numpy.where(n <= width, 0, n-width-1)
+    hi = numpy.where(n <= width, numpy.minimum(n+width+1, length),
+                     numpy.where(n >= lenData-width, length, n+width))
+
+    return lo, hi
+
+
+# Median of a sliding window of samples in O(log w) per sample. Samples enter
+# with add() and leave oldest first with pop_oldest().
+# The lower half of the window is kept in a max heap and the upper half in a
+# min heap, both keyed on (value, index) so equal values are still ordered.
+# Samples leaving the window are only dropped once they reach the top of
+# their heap (lazy deletion), the heaps are rebuilt if too many pile up
+class SlidingMedian(object):
+
+    def __init__(self):
+        self.__window = deque()
+        self.__low = []     # (-value, -index), top is the largest of the lower half
+        self.__high = []    # (value, index), top is the smallest of the upper half
+        self.__lowsize = 0
+        self.__highsize = 0
+        self.__first = 0    # index of the oldest sample in the window
+        self.__next = 0
+
+
+    def __len__(self):
+        return len(self.__window)
+
+
+    def add(self, value):
+        key = (value, self.__next)
+        self.__window.append(value)
+        self.__next += 1
+
+        if self.__lowsize == 0 or key <= (-self.__low[0][0], -self.__low[0][1]):
+            heappush(self.__low, (-value, -key[1]))
+            self.__lowsize += 1
+        else:
+            heappush(self.__high, key)
+            self.__highsize += 1
+
+        self.__balance()
+
+
+    def pop_oldest(self):
+        value = self.__window.popleft()
+        key = (value, self.__first)
+        self.__first += 1
+
+        if key <= (-self.__low[0][0], -self.__low[0][1]):
+            self.__lowsize -= 1
+        else:
+            self.__highsize -= 1
+
+        self.__balance()
+        return value
+
+
+    # same as utils.median of the window
+    def median(self):
+        if self.__lowsize > self.__highsize:
+            return -self.__low[0][0]
+
+        return (-self.__low[0][0] + self.__high[0][0])/2
+
+
+    # the lower half holds as many samples as the upper one or one more
+    def __balance(self):
+        self.__prune()
+
+        while self.__lowsize > self.__highsize+1:
+            value, index = heappop(self.__low)
+            heappush(self.__high, (-value, -index))
+            self.__lowsize, self.__highsize = self.__lowsize-1, self.__highsize+1
+            self.__prune()
+
+        while self.__lowsize < self.__highsize:
+            value, index = heappop(self.__high)
+            heappush(self.__low, (-value, -index))
+            self.__lowsize, self.__highsize = self.__lowsize+1, self.__highsize-1
+            self.__prune()
+
+
+    # drops the samples out of the window from the top of the heaps
+    def __prune(self):
+        while self.__low and -self.__low[0][1] < self.__first:
+            heappop(self.__low)
+        while self.__high and self.__high[0][1] < self.__first:
+            heappop(self.__high)
+
+        if len(self.__low) + len(self.__high) > 2*len(self.__window) + 64:
+            self.__low = [entry for entry in self.__low if -entry[1] >= self.__first]
+            self.__high = [entry for entry in self.__high if entry[1] >= self.__first]
+            heapify(self.__low)
+            heapify(self.__high)
+
+
+# Median filter of FilterHelper.filterData in O(n log w), the windows are the
+# same and only move forward so one SlidingMedian follows them.
+# Returns a numpy array
+def sliding_median(data, window=1):
+    values = numpy.asarray(data, dtype=float).tolist()
+    lo, hi = window_bounds(len(values), window)
+
+    return _sliding_median(values, lo, hi)
+
+
+# Windows up to this long are sorted by numpy all at once (a copy of every
+# window, a block of rows at a time), longer ones go through a SlidingMedian
+window_cutoff = 128
+
+
+# median of values[lo[n]:hi[n]] for every n, lo and hi never move back
+def _sliding_median(values, lo, hi):
+    if len(lo) and (hi - lo).max() <= window_cutoff:
+        return _window_median(values, lo, hi)
+
+    filtered = numpy.empty(len(lo))
+    slider = SlidingMedian()
+    start, end = 0, 0
+
+    for n, (a, b) in enumerate(zip(lo.tolist(), hi.tolist())):
+        while end < b:
+            slider.add(values[end])
+            end += 1
+        while start < a:
+            slider.pop_oldest()
+            start += 1
+
+        filtered[n] = slider.median()
+
+    return filtered
+
+
+# Same as _sliding_median with numpy.median over the windows of every length
+# (the ones at the edges are shorter), the middle two are averaged as (a+b)/2
+# like utils.median so the results are the same to the bit
+def _window_median(values, lo, hi, rows=2**20):
+    values = numpy.asarray(values, dtype=float)
+    filtered = numpy.empty(len(lo))
+    lengths = hi - lo
+
+    for length in numpy.unique(lengths).tolist():
+        windows = numpy.lib.stride_tricks.sliding_window_view(values, length)
+        index = numpy.flatnonzero(lengths == length)
+        step = max(rows // length, 1)
+        for start in range(0, len(index), step):
+            block = index[start:start+step]
+            filtered[block] = numpy.median(windows[lo[block]], axis=1)
+
+    return filtered
@@ -0,0 +1,39 @@
+from unittest import TestCase
+from random import gauss, seed
+from Lab6.classes.filter import FilterHelper, SlidingMedian, sliding_median, window_bounds, _window_median
+from Lab6.classes.utils import median
+
+
+class Test_filter(TestCase):
+    def setUp(self):
+        seed(7)
+        self.helper = FilterHelper()
+        # rounded so there are plenty of equal values
+        self.data = [round(gauss(0, 1), 1) for n in range(400)]
+
+    def test_sliding_median(self):
+        slider = SlidingMedian()
+        window = []
+        for n, value in enumerate(self.data):
+            slider.add(value)
+            window.append(value)
+            if n % 3 == 0:
+                self.assertEqual(slider.pop_oldest(), window.pop(0))
+            if window:
+                self.assertEqual(slider.median(), median(window))
+
+    def test_filterData_fast_median(self):
+        for window in [1, 2, 3, 9, 27, 129, 500]:
+            slow = self.helper.filterData(self.data, window, usemedian=True, usenumpy=False)
+            self.assertEqual(self.helper.filterData(self.data, window, usemedian=True, usefast=True), slow)
+            self.assertEqual(sliding_median(self.data, window).tolist(), slow)
+
+    def test_window_median(self):
+        for window in [2, 27, 200]:
+            lo, hi = window_bounds(len(self.data), window)
+            self.assertEqual(_window_median(self.data, lo, hi, rows=50).tolist(),
+                             self.helper.filterData(self.data, window, usemedian=True, usenumpy=False))
+
+    def test_filterData_fast_mean_unchanged(self):
+        self.assertEqual(self.helper.filterData(self.data, 9, usefast=True, usenumpy=False),
+                         self.helper.filterData(self.data, 9, usenumpy=False))